@@ -4,6 +4,7 @@
 # ============================================================
 
 import os
+import re
 from pathlib import Path
 from typing import Optional
 from pydantic_settings import BaseSettings
@@ -68,9 +69,15 @@ class PostgreSQLConfig(BaseSettings):
         }
 
 
+# Quant suffix of an Ollama model tag: "8b-q4_K_M", "8b-instruct-fp16", "Q8_0"
+_QUANT_TAG_RE = re.compile(r"(?:^|-)(i?q\d\w*|fp16|bf16|fp32)$", re.IGNORECASE)
+
+
 class OllamaConfig(BaseSettings):
     """Ollama LLM configuration."""
     base_url: str = Field(default="http://localhost:11434", env="OLLAMA_BASE_URL")
+    # A quantized tag (e.g. qwen3:8b-q4_K_M, q5_K_M, q8_0) trades quality for
+    # speed: decode is memory-bandwidth bound, so fewer bytes per weight is faster
     model: str = Field(default="qwen3:8b", env="OLLAMA_MODEL")
     timeout: int = Field(default=120, env="OLLAMA_TIMEOUT")
     temperature: float = Field(default=0.1, env="AGENT_TEMPERATURE")
@@ -78,6 +85,21 @@ class OllamaConfig(BaseSettings):
     class Config:
         extra = "ignore"
 
+    @property
+    def quantization(self) -> Optional[str]:
+        """
+        Quantization named by the model tag (qwen3:8b-q8_0 → Q8_0), or None
+        when the tag doesn't say — e.g. a bare library tag like qwen3:8b.
+        """
+        match = _QUANT_TAG_RE.search(self.model.partition(":")[2])
+        return match.group(1).upper() if match else None
+
+    @property
+    def model_label(self) -> str:
+        """Model name for status lines, with its quantization when known."""
+        quant = self.quantization
+        return f"{self.model} [{quant}]" if quant else self.model
+
 
 class AppConfig(BaseSettings):
     """Application-level configuration."""
@@ -86,6 +108,7 @@ class AppConfig(BaseSettings):
     log_level: str = Field(default="INFO", env="LOG_LEVEL")
     log_file: str = Field(default="logs/dbma.log", env="LOG_FILE")
     max_chat_history: int = Field(default=100, env="MAX_CHAT_HISTORY")
+    max_display_rows: int = Field(default=1000, env="MAX_DISPLAY_ROWS")
     max_sql_retries: int = Field(default=3, env="MAX_SQL_RETRIES")
 
     class Config:
@@ -98,6 +121,27 @@ postgres_config = PostgreSQLConfig()
 ollama_config = OllamaConfig()
 app_config = AppConfig()
 
+# ── Shared Ollama HTTP Client ─────────────────────────────────
+_ollama_http_client = None
+
+
+def get_ollama_http_client():
+    """
+    Return a process-wide pooled httpx.Client for the Ollama REST API.
+    Created on first use (httpx is imported lazily) and reused so repeated
+    calls share keep-alive connections instead of reconnecting each time.
+    """
+    global _ollama_http_client
+    if _ollama_http_client is None:
+        import httpx
+        _ollama_http_client = httpx.Client(
+            base_url=ollama_config.base_url,
+            timeout=5,
+            limits=httpx.Limits(max_keepalive_connections=4),
+        )
+    return _ollama_http_client
+
+
 # ── Ensure log directory exists ───────────────────────────────
 os.makedirs(BASE_DIR / "logs", exist_ok=True)
 
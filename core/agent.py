@@ -32,7 +32,7 @@
 
 import re
 import json
-from typing import Optional, List, Dict, Any, Generator, Tuple
+from typing import Optional, List, Dict, Any, Generator, Tuple, Callable
 from dataclasses import dataclass, field
 from enum import Enum
 from loguru import logger
@@ -126,6 +126,10 @@ class OptimizerReport:
     was_modified: bool          # True if optimizer or validator changed the SQL
 
 
+class AgentCancelled(Exception):
+    """Raised from an on_token callback to abandon an in-flight chat turn."""
+
+
 @dataclass
 class AgentResponse:
     """Structured response from the DBMA Agent."""
@@ -491,6 +495,7 @@ class DBMAAgent:
         self.persistence = persistence
         self._current_thread_id: Optional[str] = None
         self._current_database: Optional[str] = None
+        self._history_message_count: int = 0
         self._schema_context: str = ""
         self._schema_cache: Optional[Dict] = None
 
@@ -571,6 +576,7 @@ class DBMAAgent:
         self._refresh_schema(database_name, thread_id)
 
         msg_count = self.persistence.get_message_count(thread_id)
+        self._history_message_count = msg_count
         logger.info(f"Loaded thread {thread_id} with {msg_count} historical messages")
 
         # Run summarization lazily on DB switch — never during active chat turns.
@@ -679,10 +685,23 @@ class DBMAAgent:
     # MAIN CHAT ENTRY POINT
     # ════════════════════════════════════════════════════════
 
-    def chat(self, user_input: str) -> AgentResponse:
+    def chat(
+            self,
+            user_input: str,
+            on_token: Optional[Callable[[str], None]] = None,
+            is_cancelled: Optional[Callable[[], bool]] = None,
+    ) -> AgentResponse:
         """
         Main entry point. Creates a LangSmith run manually so it works
         correctly from background threads (where @traceable loses context).
+
+        If on_token is given, the main LLM reply is streamed and each chunk
+        is passed to it as it arrives; the returned AgentResponse is the same
+        fully post-processed result as the blocking path.
+
+        If is_cancelled is given, it is checked right before the turn is
+        saved; when it returns True the turn is dropped unsaved and
+        AgentCancelled is raised.
         """
         user_input = user_input.strip()
 
@@ -702,31 +721,46 @@ class DBMAAgent:
             except Exception as e:
                 logger.debug(f"LangSmith create_run failed: {e}")
 
-        response = self._chat_inner(user_input)
-
-        # ── LangSmith: close the run with output ──────────────────
-        if self._ls_active and self._ls_client:
-            try:
-                self._ls_client.update_run(
-                    run_id,
-                    outputs={
-                        "intent":       response.intent.value,
-                        "natural_text": response.natural_text[:500],
-                        "sql_query":    response.sql_query,
-                        "has_sql":      response.has_sql(),
-                        "error":        response.error,
-                        "heal_attempts": len(response.heal_attempts),
-                        "optimizer_used": response.optimizer_report is not None,
-                    },
-                    end_time=datetime.datetime.utcnow(),
-                    error=response.error,
-                )
-            except Exception as e:
-                logger.debug(f"LangSmith update_run failed: {e}")
+        response: Optional[AgentResponse] = None
+        error_msg: Optional[str] = None
+        try:
+            response = self._chat_inner(user_input, on_token, is_cancelled)
+            error_msg = response.error
+        except AgentCancelled:
+            error_msg = "cancelled"
+            raise
+        except Exception as e:
+            error_msg = str(e)
+            raise
+        finally:
+            # ── LangSmith: close the run with output (even if abandoned) ──
+            if self._ls_active and self._ls_client:
+                try:
+                    self._ls_client.update_run(
+                        run_id,
+                        outputs={
+                            "intent":       response.intent.value,
+                            "natural_text": response.natural_text[:500],
+                            "sql_query":    response.sql_query,
+                            "has_sql":      response.has_sql(),
+                            "error":        response.error,
+                            "heal_attempts": len(response.heal_attempts),
+                            "optimizer_used": response.optimizer_report is not None,
+                        } if response is not None else {"error": error_msg},
+                        end_time=datetime.datetime.utcnow(),
+                        error=error_msg,
+                    )
+                except Exception as e:
+                    logger.debug(f"LangSmith update_run failed: {e}")
 
         return response
 
-    def _chat_inner(self, user_input: str) -> AgentResponse:
+    def _chat_inner(
+            self,
+            user_input: str,
+            on_token: Optional[Callable[[str], None]] = None,
+            is_cancelled: Optional[Callable[[], bool]] = None,
+    ) -> AgentResponse:
         """Internal chat logic — called by chat() which handles LangSmith wrapping."""
 
         # ── STEP 1: Classify intent first (before any DB check) ──
@@ -736,6 +770,7 @@ class DBMAAgent:
         # ── STEP 2: Handle quick intents that need no DB ──────────
         quick_response = self._handle_quick_intents(user_input, intent)
         if quick_response is not None:
+            self._raise_if_cancelled(is_cancelled)
             self._save_interaction(user_input, quick_response)
             return quick_response
 
@@ -805,7 +840,12 @@ class DBMAAgent:
         messages.append({"role": "user", "content": user_input})
 
         try:
-            llm_response_text = self._invoke_llm(messages)
+            if on_token is None:
+                llm_response_text = self._invoke_llm(messages)
+            else:
+                llm_response_text = self._collect_stream(messages, on_token)
+        except AgentCancelled:
+            raise
         except Exception as e:
             logger.error(f"LLM invocation failed: {e}")
             return AgentResponse(
@@ -870,9 +910,16 @@ class DBMAAgent:
             optimizer_report=optimizer_report,
         )
 
+        self._raise_if_cancelled(is_cancelled)
         self._save_interaction(user_input, response)
         return response
 
+    @staticmethod
+    def _raise_if_cancelled(is_cancelled: Optional[Callable[[], bool]]) -> None:
+        """Abandon the turn before it is persisted if the caller gave up on it."""
+        if is_cancelled is not None and is_cancelled():
+            raise AgentCancelled()
+
     # ════════════════════════════════════════════════════════
     # FEATURE 1 — SELF-HEALING QUERY RETRY LOOP
     # ════════════════════════════════════════════════════════
@@ -1239,6 +1286,60 @@ class DBMAAgent:
         Invoke Ollama with full LangSmith tracing.
         Uses direct LangSmith Client API (thread-safe, no @traceable needed).
 
+        FIX 1: role "human" mapped to "user" so history is NOT silently dropped.
+        FIX 2: /no_think appended to suppress qwen3 chain-of-thought tokens.
+        """
+        full_prompt = self._build_llm_prompt(messages)
+        llm_run_id  = self._open_llm_run(full_prompt, parent_run_id)
+
+        # ── Call Ollama ───────────────────────────────────────────
+        response  = ""
+        error_msg = None
+        try:
+            response  = self._llm.invoke(full_prompt, config=self._llm_callbacks_config())
+        except Exception as e:
+            error_msg = str(e)
+            raise
+
+        self._close_llm_run(llm_run_id, response, error_msg)
+        return response
+
+    def _collect_stream(
+            self,
+            messages: List[Dict[str, str]],
+            on_token: Callable[[str], None],
+            parent_run_id: str = None,
+    ) -> str:
+        """
+        Stream the LLM reply, forwarding each chunk to on_token. Returns the
+        full text. Traced like _invoke_llm — an Ollama-LLM run plus the
+        LangChain tracer callbacks — and the run is closed even when the
+        turn is cancelled mid-stream.
+        """
+        full_prompt = self._build_llm_prompt(messages)
+        llm_run_id  = self._open_llm_run(full_prompt, parent_run_id)
+
+        chunks    = []
+        error_msg = None
+        try:
+            for chunk in self._llm.stream(full_prompt, config=self._llm_callbacks_config()):
+                chunks.append(chunk)
+                on_token(chunk)
+        except AgentCancelled:
+            error_msg = "cancelled"
+            raise
+        except Exception as e:
+            error_msg = str(e)
+            raise
+        finally:
+            self._close_llm_run(llm_run_id, "".join(chunks), error_msg)
+        return "".join(chunks)
+
+    @staticmethod
+    def _build_llm_prompt(messages: List[Dict[str, str]]) -> str:
+        """
+        Flatten chat messages into the single prompt string sent to Ollama.
+
         FIX 1: role "human" mapped to "user" so history is NOT silently dropped.
         FIX 2: /no_think appended to suppress qwen3 chain-of-thought tokens.
         """
@@ -1254,11 +1355,15 @@ class DBMAAgent:
                 prompt_parts.append(f"[ASSISTANT]\n{content}\n")
 
         # FIX 2: /no_think suppresses <think>...</think> output from qwen3/deepseek
-        full_prompt = "\n".join(prompt_parts) + "\n[ASSISTANT]\n/no_think\n"
+        return "\n".join(prompt_parts) + "\n[ASSISTANT]\n/no_think\n"
+
+    def _llm_callbacks_config(self) -> dict:
+        """LangChain run config carrying the LangSmith tracer, if one is set up."""
+        return {"callbacks": [self._ls_tracer]} if self._ls_tracer else {}
 
-        # ── Open LangSmith LLM run ────────────────────────────────
-        llm_run_id  = str(uuid.uuid4())
-        llm_start   = datetime.datetime.utcnow()
+    def _open_llm_run(self, full_prompt: str, parent_run_id: str = None) -> str:
+        """Open the LangSmith "Ollama-LLM" run for one LLM call. Returns its id."""
+        llm_run_id = str(uuid.uuid4())
         if self._ls_active and self._ls_client:
             try:
                 self._ls_client.create_run(
@@ -1268,26 +1373,15 @@ class DBMAAgent:
                     project_name=self._ls_project,
                     parent_run_id=parent_run_id,
                     inputs={"prompt": full_prompt[-2000:], "model": ollama_config.model},
-                    start_time=llm_start,
+                    start_time=datetime.datetime.utcnow(),
                     extra={"model": ollama_config.model, "temperature": ollama_config.temperature},
                 )
             except Exception as e:
                 logger.debug(f"LangSmith LLM run open failed: {e}")
+        return llm_run_id
 
-        # ── Call Ollama ───────────────────────────────────────────
-        response  = ""
-        error_msg = None
-        try:
-            callbacks = [self._ls_tracer] if self._ls_tracer else None
-            response  = self._llm.invoke(
-                full_prompt,
-                config={"callbacks": callbacks} if callbacks else {},
-            )
-        except Exception as e:
-            error_msg = str(e)
-            raise
-
-        # ── Close LangSmith LLM run ───────────────────────────────
+    def _close_llm_run(self, llm_run_id: str, response: str, error_msg: Optional[str]) -> None:
+        """Close a run opened by _open_llm_run with the (possibly partial) response."""
         if self._ls_active and self._ls_client:
             try:
                 self._ls_client.update_run(
@@ -1299,8 +1393,6 @@ class DBMAAgent:
             except Exception as e:
                 logger.debug(f"LangSmith LLM run close failed: {e}")
 
-        return response
-
     def _stream_llm(self, messages: List[Dict[str, str]]) -> Generator[str, None, None]:
         """
         ⚠️  LLM INTEGRATION REQUIRED
@@ -1309,19 +1401,7 @@ class DBMAAgent:
         FIX 1: role "human" mapped to "user" so history is NOT silently dropped.
         FIX 2: /no_think appended to suppress qwen3 chain-of-thought tokens.
         """
-        prompt_parts = []
-        for msg in messages:
-            role    = msg["role"]
-            content = msg["content"]
-            if role == "system":
-                prompt_parts.append(f"[SYSTEM]\n{content}\n")
-            elif role in ("user", "human"):   # FIX 1: accept both role names
-                prompt_parts.append(f"[USER]\n{content}\n")
-            elif role == "assistant":
-                prompt_parts.append(f"[ASSISTANT]\n{content}\n")
-
-        # FIX 2: /no_think suppresses <think>...</think> output from qwen3/deepseek
-        full_prompt = "\n".join(prompt_parts) + "\n[ASSISTANT]\n/no_think\n"
+        full_prompt = self._build_llm_prompt(messages)
 
         # ⚠️  LLM INTEGRATION REQUIRED — Stream from Ollama
         for chunk in self._llm.stream(full_prompt):
@@ -1772,6 +1852,11 @@ class DBMAAgent:
     def current_database(self) -> Optional[str]:
         return self._current_database
 
+    @property
+    def history_message_count(self) -> int:
+        """Saved messages in the current thread when its context was last set."""
+        return self._history_message_count
+
     @property
     def schema_summary(self) -> str:
         """Returns a brief schema summary for UI display."""
@@ -111,6 +111,11 @@ class MySQLManager:
             pass
         return False
 
+    @property
+    def connected(self) -> bool:
+        """Last known connection state — a flag read, no server round-trip."""
+        return self._connected
+
     def reconnect(self) -> bool:
         """Attempt to reconnect."""
         self.disconnect()
@@ -173,7 +178,7 @@ class MySQLManager:
                     success=True,
                     query=query,
                     columns=columns,
-                    rows=list(rows),
+                    rows=rows,  # fetchall() already returns a list — don't copy it
                     execution_ms=elapsed,
                     query_type=query_type,
                 )
@@ -4,9 +4,11 @@
 # ============================================================
 
 import json
+import atexit
 import hashlib
+import threading
 from typing import Optional, List, Dict, Any, Tuple
-from datetime import datetime
+from datetime import datetime, timezone
 import psycopg2
 import psycopg2.extras
 from loguru import logger
@@ -56,11 +58,21 @@ class PersistenceManager:
     - Each MySQL database gets its own isolated chat thread
     - Full chat history is loaded when switching to a database
     - Agent state checkpoints are stored for resumability
+    - Query audit rows are buffered and written in multi-row batches
     """
 
+    # Buffered query-history rows are flushed once this many accumulate
+    HISTORY_BATCH_SIZE = 32
+    # Rows kept for retry while PostgreSQL is unreachable; the oldest beyond this are dropped
+    HISTORY_BUFFER_MAX = HISTORY_BATCH_SIZE * 32
+
     def __init__(self):
         self._conn: Optional[psycopg2.extensions.connection] = None
         self._initialized: bool = False
+        self._history_buffer: List[Tuple] = []
+        self._history_lock = threading.Lock()
+        self._closed: bool = False
+        atexit.register(self._flush_at_exit)
 
     # ── Connection ────────────────────────────────────────────
 
@@ -71,6 +83,7 @@ class PersistenceManager:
             self._conn.autocommit = True
             psycopg2.extras.register_uuid()
             self._initialized = True
+            self._closed = False
             logger.info(f"Connected to PostgreSQL persistence DB: {postgres_config.db}")
             return True
         except Exception as e:
@@ -80,6 +93,11 @@ class PersistenceManager:
 
     def disconnect(self):
         """Close PostgreSQL connection."""
+        if not self.flush_query_history():
+            with self._history_lock:
+                lost, self._history_buffer = len(self._history_buffer), []
+            logger.error(f"Query history: {lost} buffered rows dropped on disconnect")
+        self._closed = True
         if self._conn and not self._conn.closed:
             self._conn.close()
             logger.info("Disconnected from PostgreSQL")
@@ -267,10 +285,15 @@ class PersistenceManager:
             self,
             thread_id: str,
             limit: Optional[int] = None,
+            before_seq: Optional[int] = None,
     ) -> List[ChatMessage]:
         """
         Load chat history for a database thread in chronological order.
 
+        before_seq pages backwards with a keyset cursor: only messages with
+        sequence_no < before_seq are considered, so each older page is an
+        index range scan on (thread_id, sequence_no) — never an OFFSET.
+
         BUG FIX: The old query used ORDER BY ASC + LIMIT which returned the
         OLDEST N messages, so new messages were silently cut off.
 
@@ -289,31 +312,36 @@ class PersistenceManager:
             ORDER BY sequence_no ASC        ← re-sort for display order
         """
         self.ensure_connected()
+        where = "thread_id = %s"
+        params: list = [thread_id]
+        if before_seq is not None:
+            where += " AND sequence_no < %s"
+            params.append(before_seq)
         try:
             with self._conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor) as cursor:
                 if limit:
                     # Fetch newest N, then re-sort chronologically for display
                     cursor.execute(
-                        """
+                        f"""
                         SELECT * FROM (
                             SELECT * FROM dbma_messages
-                            WHERE thread_id = %s
+                            WHERE {where}
                             ORDER BY sequence_no DESC
                             LIMIT %s
                         ) sub
                         ORDER BY sequence_no ASC
                         """,
-                        (thread_id, limit),
+                        (*params, limit),
                     )
                 else:
                     # No limit — load every message in chronological order
                     cursor.execute(
-                        """
+                        f"""
                         SELECT * FROM dbma_messages
-                        WHERE thread_id = %s
+                        WHERE {where}
                         ORDER BY sequence_no ASC
                         """,
-                        (thread_id,),
+                        tuple(params),
                     )
 
                 rows = cursor.fetchall()
@@ -471,25 +499,72 @@ class PersistenceManager:
             error_message: Optional[str] = None,
             message_id: Optional[str] = None,
     ) -> bool:
-        """Save executed query to audit history."""
+        """
+        Queue an executed query for the audit history.
+        Rows are buffered and written in one batch every HISTORY_BATCH_SIZE
+        queries, on flush_query_history(), before reads, and at exit.
+        """
+        row = (
+            thread_id, message_id, sql_query, execution_ms,
+            rows_affected, success, error_message, datetime.now(timezone.utc),
+        )
+        with self._history_lock:
+            self._history_buffer.append(row)
+            if len(self._history_buffer) < self.HISTORY_BATCH_SIZE:
+                return True
+        return self.flush_query_history()
+
+    def flush_query_history(self) -> bool:
+        """
+        Write all buffered query-history rows to PostgreSQL.
+        On failure the rows go back to the front of the buffer for the next
+        flush; only the oldest beyond HISTORY_BUFFER_MAX are dropped.
+        """
+        with self._history_lock:
+            rows, self._history_buffer = self._history_buffer, []
+        if not rows:
+            return True
+        if self.save_query_history_batch(rows):
+            return True
+        with self._history_lock:
+            self._history_buffer[:0] = rows
+            overflow = len(self._history_buffer) - self.HISTORY_BUFFER_MAX
+            if overflow > 0:
+                del self._history_buffer[:overflow]
+        if overflow > 0:
+            logger.error(f"Query history: {overflow} buffered rows dropped (buffer full)")
+        return False
+
+    def _flush_at_exit(self):
+        """atexit hook — skipped after disconnect() so shutdown never reconnects."""
+        if self._closed or not self._history_buffer:
+            return
+        self.flush_query_history()
+
+    def save_query_history_batch(self, rows: List[Tuple]) -> bool:
+        """
+        Insert many audit rows with a single multi-row INSERT.
+        Each row is (thread_id, message_id, sql_query, execution_ms,
+        rows_affected, success, error_message, executed_at).
+        """
         self.ensure_connected()
         try:
             with self._conn.cursor() as cursor:
-                cursor.execute(
+                psycopg2.extras.execute_values(
+                    cursor,
                     """
                     INSERT INTO dbma_query_history
-                        (thread_id, message_id, sql_query, execution_ms, 
-                         rows_affected, success, error_message)
-                    VALUES (%s, %s, %s, %s, %s, %s, %s)
+                        (thread_id, message_id, sql_query, execution_ms,
+                         rows_affected, success, error_message, executed_at)
+                    VALUES %s
                     """,
-                    (
-                        thread_id, message_id, sql_query,
-                        execution_ms, rows_affected, success, error_message
-                    ),
+                    rows,
+                    page_size=len(rows),
                 )
+            logger.debug(f"Query history flushed: {len(rows)} rows")
             return True
         except Exception as e:
-            logger.error(f"save_query_history error: {e}")
+            logger.error(f"save_query_history_batch error: {e}")
             return False
 
     def get_query_history(
@@ -498,6 +573,7 @@ class PersistenceManager:
             limit: int = 50,
     ) -> List[Dict[str, Any]]:
         """Get recent query execution history for a database."""
+        self.flush_query_history()
         self.ensure_connected()
         try:
             with self._conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor) as cursor:
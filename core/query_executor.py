@@ -3,12 +3,12 @@
 # core/query_executor.py — SQL Execution & MySQL-style Output Formatter
 # ============================================================
 
-from typing import Optional, List, Callable
-from rich.console import Console
+import io
+from functools import lru_cache
+from typing import Optional, List, Callable, Tuple, Iterator, TYPE_CHECKING
+from rich.console import Console, Group
 from rich.table import Table
 from rich.text import Text
-from rich.panel import Panel
-from rich.syntax import Syntax
 from rich import box
 from loguru import logger
 
@@ -16,6 +16,99 @@ from core.mysql_manager import MySQLManager, QueryResult
 from core.persistence import PersistenceManager
 from config import app_config
 
+if TYPE_CHECKING:
+    from rich.syntax import Syntax
+
+# One Console per process — terminal capability detection runs once and
+# every executor shares the same render lock
+_SHARED_CONSOLE = Console()
+
+# ── Constant renderables (built once, copied before appending timing) ──
+_DB_CHANGED = Text("Database changed", style="green")
+_TXN_OK = Text("Query OK", style="bold green")
+_QUERY_OK = Text()
+_QUERY_OK.append("Query OK", style="bold green")
+_EMPTY_SET = Text()
+_EMPTY_SET.append("Empty set ", style="dim")
+
+# ── Cell stringification — dispatch on exact type, str() as fallback ──
+# bytes/bytearray (BLOB, BINARY) decode to text instead of "b'...'"
+_STRINGIFIERS = {
+    str: lambda s: s,
+    int: int.__str__,
+    type(None): lambda _: "NULL",
+    bytes: lambda b: b.decode("utf-8", "replace"),
+    bytearray: lambda b: b.decode("utf-8", "replace"),
+}
+
+_NULL_CELL = Text("NULL", style="dim italic yellow")
+
+
+def _table_cell(cell):
+    """Generic Rich-table cell conversion (NULL-aware, type-dispatched)."""
+    if cell is None:
+        return _NULL_CELL
+    return _STRINGIFIERS.get(type(cell), str)(cell)
+
+
+@lru_cache(maxsize=64)
+def _table_row_builder(shape: Tuple[type, ...]) -> Callable[[tuple], tuple]:
+    """
+    Generate a row → cells function specialized for one result shape
+    (the tuple of first-row cell types). The row is unpacked once and each
+    column gets an inline type check plus its converter — str columns pass
+    through with no call; cells of any other type (e.g. NULL) use
+    _table_cell. Repeated SELECTs with the same shape reuse the cached builder.
+    """
+    if not shape:
+        return lambda row: ()
+
+    namespace = {"_cell": _table_cell, "_str": str}
+    names = [f"c{i}" for i in range(len(shape))]
+    exprs = []
+    for i, (name, t) in enumerate(zip(names, shape)):
+        if t is type(None):
+            exprs.append(f"_cell({name})")
+        elif t is str:
+            exprs.append(f"{name} if {name}.__class__ is _str else _cell({name})")
+        else:
+            namespace[f"_t{i}"] = t
+            namespace[f"_f{i}"] = _STRINGIFIERS.get(t, str)
+            exprs.append(f"_f{i}({name}) if {name}.__class__ is _t{i} else _cell({name})")
+
+    src = (
+        "def _build_row(row):\n"
+        f"    {', '.join(names)}, = row\n"
+        f"    return ({', '.join(exprs)},)\n"
+    )
+    exec(compile(src, f"<row-builder {len(shape)} cols>", "exec"), namespace)
+    return namespace["_build_row"]
+
+
+@lru_cache(maxsize=1)
+def _sql_highlighter():
+    """
+    Build the Pygments SQL lexer and monokai theme once, on first use.
+    Imported lazily so entry points that never highlight SQL skip Pygments.
+    """
+    from rich.syntax import Syntax
+    from pygments.lexers.sql import SqlLexer
+    return SqlLexer(), Syntax.get_theme("monokai")
+
+
+@lru_cache(maxsize=128)
+def _sql_syntax(sql: str):
+    """Build (and memoize) a highlighted Syntax renderable for a SQL string."""
+    from rich.syntax import Syntax
+    lexer, theme = _sql_highlighter()
+    return Syntax(
+        sql,
+        lexer,
+        theme=theme,
+        line_numbers=False,
+        word_wrap=True,
+    )
+
 
 class QueryExecutor:
     """
@@ -34,7 +127,7 @@ class QueryExecutor:
     ):
         self.mysql = mysql_manager
         self.persistence = persistence
-        self.console = console or Console()
+        self.console = console or _SHARED_CONSOLE
         self._current_thread_id: Optional[str] = None
 
     def set_thread(self, thread_id: str):
@@ -60,18 +153,23 @@ class QueryExecutor:
         """
         result = self.mysql.execute_query(sql)
 
-        # Build formatted output
-        formatted_lines = self._format_result(result, sql)
+        # Build formatted output — skipped entirely when nobody will read it
+        if print_output or output_callback:
+            formatted_lines = self._format_result(result, sql)
 
-        if print_output:
-            for line in formatted_lines:
-                self.console.print(line)
+            # Render all pieces as one Group — one lock/render/flush instead of N
+            output = Group(*formatted_lines)
 
-        if output_callback:
-            for line in formatted_lines:
-                output_callback(line)
+            if print_output:
+                self.console.print(output)
 
-        # Persist query to history
+            if output_callback:
+                with self.console.capture() as capture:
+                    self.console.print(output)
+                for line in capture.get().splitlines():
+                    output_callback(line)
+
+        # Persist query to history (buffered — PostgreSQL is written in batches)
         if self._current_thread_id:
             self.persistence.save_query_history(
                 thread_id=self._current_thread_id,
@@ -100,38 +198,38 @@ class QueryExecutor:
             return output
 
         query_type = result.query_type
+        timing_str = f"({result.execution_ms / 1000:.3f} sec)"
 
         if query_type in ("SELECT", "SHOW", "DESCRIBE", "EXPLAIN"):
-            if result.rows:
+            if len(result.rows) > app_config.max_display_rows:
+                # Too big for Rich's per-row layout — plain text table, truncated
+                # to max_display_rows (includes the hidden and total row counts)
+                output.append(Text(self.format_result_as_text(result)))
+            elif result.rows:
                 # Build Rich table (MySQL-style)
                 table = self._build_mysql_table(result)
                 output.append(table)
 
                 # Row count line: "5 rows in set (0.002 sec)"
                 row_word = "row" if len(result.rows) == 1 else "rows"
-                timing = result.execution_ms / 1000
                 count_text = Text()
                 count_text.append(f"{len(result.rows)} {row_word} in set ", style="dim")
-                count_text.append(f"({timing:.3f} sec)", style="dim italic")
+                count_text.append(timing_str, style="dim italic")
                 output.append(count_text)
             else:
                 # Empty set
-                empty_text = Text()
-                empty_text.append("Empty set ", style="dim")
-                empty_text.append(f"({result.execution_ms / 1000:.3f} sec)", style="dim italic")
+                empty_text = _EMPTY_SET.copy()
+                empty_text.append(timing_str, style="dim italic")
                 output.append(empty_text)
 
         elif query_type == "USE":
-            ok_text = Text()
-            ok_text.append("Database changed", style="green")
-            output.append(ok_text)
+            output.append(_DB_CHANGED)
 
         elif query_type in ("INSERT", "UPDATE", "DELETE"):
-            ok_text = Text()
-            ok_text.append("Query OK", style="bold green")
+            ok_text = _QUERY_OK.copy()
             row_word = "row" if result.affected_rows == 1 else "rows"
             ok_text.append(f", {result.affected_rows} {row_word} affected ", style="green")
-            ok_text.append(f"({result.execution_ms / 1000:.3f} sec)", style="dim italic")
+            ok_text.append(timing_str, style="dim italic")
             if result.last_insert_id and query_type == "INSERT":
                 output.append(ok_text)
                 id_text = Text(f"  Last INSERT ID: {result.last_insert_id}", style="dim cyan")
@@ -140,21 +238,19 @@ class QueryExecutor:
                 output.append(ok_text)
 
         elif query_type in ("CREATE", "DROP", "ALTER", "TRUNCATE"):
-            ok_text = Text()
-            ok_text.append("Query OK", style="bold green")
-            ok_text.append(f", 0 rows affected ", style="green")
-            ok_text.append(f"({result.execution_ms / 1000:.3f} sec)", style="dim italic")
+            ok_text = _QUERY_OK.copy()
+            ok_text.append(", 0 rows affected ", style="green")
+            ok_text.append(timing_str, style="dim italic")
             output.append(ok_text)
 
         elif query_type == "TRANSACTION":
-            ok_text = Text("Query OK", style="bold green")
-            output.append(ok_text)
+            output.append(_TXN_OK)
 
         else:
             # Generic success
-            ok_text = Text()
-            ok_text.append("Query OK ", style="bold green")
-            ok_text.append(f"({result.execution_ms / 1000:.3f} sec)", style="dim italic")
+            ok_text = _QUERY_OK.copy()
+            ok_text.append(" ")
+            ok_text.append(timing_str, style="dim italic")
             output.append(ok_text)
 
         return output
@@ -183,76 +279,98 @@ class QueryExecutor:
         for col_name in result.columns:
             table.add_column(str(col_name), style="white", no_wrap=False)
 
-        # Add rows
+        # Add rows — converted by a shape-specialized builder. _format_result
+        # only gets here with at most max_display_rows rows; larger results
+        # take the truncated plain-text path instead
+        build_row = _table_row_builder(tuple(map(type, result.rows[0]))) if result.rows else None
         for row in result.rows:
-            str_row = []
-            for cell in row:
-                if cell is None:
-                    str_row.append(Text("NULL", style="dim italic yellow"))
-                else:
-                    str_row.append(str(cell))
-            table.add_row(*str_row)
+            table.add_row(*build_row(row))
 
         return table
 
-    def format_sql_syntax(self, sql: str) -> Syntax:
+    def format_sql_syntax(self, sql: str) -> "Syntax":
         """Return a Rich Syntax object for SQL highlighting."""
-        return Syntax(
-            sql,
-            "sql",
-            theme="monokai",
-            line_numbers=False,
-            word_wrap=True,
-        )
+        return _sql_syntax(sql)
 
     def format_result_as_text(self, result: QueryResult) -> str:
         """
         Format result as plain text string (for chat panel display).
         Used when we need string output rather than Rich renderables.
+        Only the first app_config.max_display_rows rows are rendered.
+        """
+        # Pieces go straight into one StringIO — no list of every line plus a join
+        buf = io.StringIO()
+        write = buf.write
+        pieces = self.format_result_as_text_chunks(result)
+        write(next(pieces))
+        for piece in pieces:
+            write("\n")
+            write(piece)
+        return buf.getvalue()
+
+    def format_result_as_text_chunks(
+            self,
+            result: QueryResult,
+            chunk_rows: int = 200,
+    ) -> Iterator[str]:
+        """
+        Yield the plain-text rendering of a result in pieces — table header,
+        then up to chunk_rows rows per piece, then the footer — so callers can
+        hand it to the UI incrementally. Pieces carry no trailing newline;
+        joined with newlines they are exactly format_result_as_text().
         """
         if not result.success:
-            return f"ERROR: {result.error}"
+            yield f"ERROR: {result.error}"
+            return
+
+        timing_str = f"({result.execution_ms / 1000:.3f} sec)"
 
         if result.query_type in ("SELECT", "SHOW", "DESCRIBE", "EXPLAIN"):
             if not result.rows:
-                return "Empty set"
+                yield "Empty set"
+                return
 
             # Simple text table
             if not result.columns:
-                return str(result.rows)
+                yield str(result.rows)
+                return
 
-            lines = []
-            col_widths = [len(str(c)) for c in result.columns]
-            for row in result.rows:
-                for i, cell in enumerate(row):
-                    col_widths[i] = max(col_widths[i], len(str(cell) if cell is not None else "NULL"))
+            shown_rows = result.rows[:app_config.max_display_rows]
+            hidden = len(result.rows) - len(shown_rows)
+
+            stringify = _STRINGIFIERS.get
+
+            # Stringify every shown cell once — reused for widths and row emission
+            str_rows = [[stringify(type(c), str)(c) for c in row] for row in shown_rows]
+            header_widths = [len(str(c)) for c in result.columns]
+            data_widths = [max(map(len, col)) for col in zip(*str_rows)]
+            col_widths = list(map(max, header_widths, data_widths))
 
             # Header
             sep = "+" + "+".join("-" * (w + 2) for w in col_widths) + "+"
-            header = "|" + "|".join(f" {str(c):<{w}} " for c, w in zip(result.columns, col_widths)) + "|"
-            lines.append(sep)
-            lines.append(header)
-            lines.append(sep)
-
-            # Rows
-            for row in result.rows:
-                cells = []
-                for cell, w in zip(row, col_widths):
-                    val = "NULL" if cell is None else str(cell)
-                    cells.append(f" {val:<{w}} ")
-                lines.append("|" + "|".join(cells) + "|")
-            lines.append(sep)
-
+            header = "| " + " | ".join([str(c).ljust(w) for c, w in zip(result.columns, col_widths)]) + " |"
+            yield f"{sep}\n{header}\n{sep}"
+
+            # Rows — one piece per chunk_rows rows
+            for start in range(0, len(str_rows), chunk_rows):
+                yield "\n".join([
+                    "| " + " | ".join([val.ljust(w) for val, w in zip(str_row, col_widths)]) + " |"
+                    for str_row in str_rows[start:start + chunk_rows]
+                ])
+
+            footer = [sep]
+            if hidden:
+                footer.append(f"... ({hidden} more rows not shown)")
             row_word = "row" if len(result.rows) == 1 else "rows"
-            lines.append(f"{len(result.rows)} {row_word} in set ({result.execution_ms / 1000:.3f} sec)")
-            return "\n".join(lines)
+            footer.append(f"{len(result.rows)} {row_word} in set {timing_str}")
+            yield "\n".join(footer)
 
         elif result.query_type in ("INSERT", "UPDATE", "DELETE"):
-            return f"Query OK, {result.affected_rows} row(s) affected ({result.execution_ms / 1000:.3f} sec)"
+            yield f"Query OK, {result.affected_rows} row(s) affected {timing_str}"
         elif result.query_type == "USE":
-            return "Database changed"
+            yield "Database changed"
         else:
-            return f"Query OK ({result.execution_ms / 1000:.3f} sec)"
+            yield f"Query OK {timing_str}"
 
     def confirm_destructive(self, sql: str) -> bool:
         """
@@ -260,6 +378,7 @@ class QueryExecutor:
         In TUI mode, this is handled by the UI layer.
         Returns True (prompt handled by UI).
         """
+        from rich.panel import Panel
         self.console.print(
             Panel(
                 f"[bold red]⚠️  DESTRUCTIVE OPERATION WARNING[/bold red]\n\n"
@@ -21,14 +21,17 @@
 
 import sys
 import os
+import json
+import time
 import click
-from loguru import logger
+from pathlib import Path
 
 # Add project root to path
 sys.path.insert(0, os.path.dirname(__file__))
 
-from utils.logger import setup_logger
-from config import app_config, mysql_config, postgres_config, ollama_config
+# Heavy modules (loguru, Rich, Textual, DB drivers) are imported inside the
+# launch functions so `dbma version` / `dbma setup` don't pay for them.
+from config import app_config, mysql_config, postgres_config, ollama_config, get_ollama_http_client
 
 
 @click.group(invoke_without_command=True)
@@ -74,6 +77,8 @@ def inspect(database: str):
 
 def launch_tui():
     """Start the full Textual TUI application."""
+    from loguru import logger
+    from utils.logger import setup_logger
     setup_logger(app_config.log_file, app_config.log_level)
     logger.info(f"Starting DBMA v{app_config.version} (TUI mode)")
 
@@ -91,6 +96,7 @@ def launch_simple_cli():
     Simple CLI mode — no Textual TUI, just a readline-based shell.
     Useful for environments where TUI doesn't work or for debugging.
     """
+    from utils.logger import setup_logger
     setup_logger(app_config.log_file, app_config.log_level)
 
     from simple_cli import SimpleCLI
@@ -147,6 +153,7 @@ def show_version():
 def run_inspect(database: str):
     """Inspect and print a database schema."""
     # setup_logger(log_level="WARNING")
+    from utils.logger import setup_logger
     setup_logger(app_config.log_file, "WARNING")
 
     from core.mysql_manager import MySQLManager
@@ -164,12 +171,52 @@ def run_inspect(database: str):
 
 # ── Pre-flight Checks ─────────────────────────────────────────
 
+PREFLIGHT_CACHE_FILE = Path.home() / ".cache" / "dbma" / "preflight.json"
+PREFLIGHT_CACHE_TTL = 60  # seconds
+
+
+def _preflight_cache_is_fresh() -> bool:
+    """True if a successful Ollama probe for the current config ran within the TTL."""
+    try:
+        cached = json.loads(PREFLIGHT_CACHE_FILE.read_text())
+    except (OSError, ValueError):
+        return False
+    return (
+        cached.get("ollama_ok") is True
+        and cached.get("model_present") is True
+        and cached.get("base_url") == ollama_config.base_url
+        and cached.get("model") == ollama_config.model
+        and time.time() - cached.get("checked_at", 0) < PREFLIGHT_CACHE_TTL
+    )
+
+
+def _save_preflight_cache(ollama_ok: bool, model_present: bool) -> None:
+    """Record the Ollama probe result so launches within the TTL can skip it."""
+    try:
+        PREFLIGHT_CACHE_FILE.parent.mkdir(parents=True, exist_ok=True)
+        PREFLIGHT_CACHE_FILE.write_text(json.dumps({
+            "ollama_ok": ollama_ok,
+            "model_present": model_present,
+            "base_url": ollama_config.base_url,
+            "model": ollama_config.model,
+            "checked_at": time.time(),
+        }))
+    except OSError:
+        pass
+
+
 def _check_environment() -> bool:
     """Run environment checks before launching."""
+    # Containers / service managers provide config via env — skip the checks
+    if os.getenv("DBMA_SKIP_PREFLIGHT") == "1":
+        return True
+
     issues = []
 
-    # Check .env exists
-    if not os.path.exists(".env"):
+    # Check .env exists — one stat on the common path; .env.example only on a miss
+    try:
+        os.stat(".env")
+    except OSError:
         if os.path.exists(".env.example"):
             print("⚠️  No .env file found! Copying .env.example → .env")
             import shutil
@@ -178,23 +225,37 @@ def _check_environment() -> bool:
         else:
             issues.append(".env file not found")
 
-    # Check Ollama is reachable
+    # Check Ollama is reachable — skipped if it was verified in the last minute
+    if not _preflight_cache_is_fresh():
+        _check_ollama(issues)
+
+    if issues:
+        for issue in issues:
+            print(f"❌ {issue}")
+        return False
+
+    return True
+
+
+def _check_ollama(issues: list) -> None:
+    """Probe Ollama for reachability and the configured model."""
     try:
-        import httpx
-        resp = httpx.get(f"{ollama_config.base_url}/api/tags", timeout=5)
+        resp = get_ollama_http_client().get("/api/tags")
         if resp.status_code != 200:
             issues.append(f"Ollama not responding at {ollama_config.base_url}")
         else:
             models = resp.json().get("models", [])
             model_names = [m["name"] for m in models]
-            if ollama_config.model not in model_names and not any(
+            model_present = ollama_config.model in model_names or any(
                 ollama_config.model.split(":")[0] in m for m in model_names
-            ):
+            )
+            if not model_present:
                 print(
                     f"⚠️  Model '{ollama_config.model}' not found in Ollama.\n"
                     f"   Available: {', '.join(model_names[:5]) if model_names else 'none'}\n"
                     f"   Run: ollama pull {ollama_config.model}"
                 )
+            _save_preflight_cache(ollama_ok=True, model_present=model_present)
     except Exception as e:
         issues.append(f"Ollama unreachable ({ollama_config.base_url}): {e}")
         print(
@@ -204,13 +265,6 @@ def _check_environment() -> bool:
             f"   DBMA will start but LLM features will be unavailable."
         )
 
-    if issues:
-        for issue in issues:
-            print(f"❌ {issue}")
-        return False
-
-    return True
-
 
 # ── Entry Point ───────────────────────────────────────────────
 
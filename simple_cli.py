@@ -10,31 +10,97 @@
 import sys
 import re
 import os
-from typing import Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, List, Iterable, Dict, Tuple, Callable, TYPE_CHECKING
 from prompt_toolkit import PromptSession
 from prompt_toolkit.history import FileHistory
-from prompt_toolkit.auto_suggest import AutoSuggestFromHistory
+from prompt_toolkit.auto_suggest import AutoSuggestFromHistory, Suggestion
 from prompt_toolkit.styles import Style
 from prompt_toolkit.formatted_text import HTML
 from rich.console import Console
+from rich.live import Live
 from rich.panel import Panel
 from rich.text import Text
-from rich.table import Table
-from rich import box
 
 from core.mysql_manager import MySQLManager
 from core.persistence import PersistenceManager
-from core.agent import DBMAAgent, AgentIntent
-from core.query_executor import QueryExecutor
 from utils.helpers import is_safe_query, get_timestamp
 from config import mysql_config, postgres_config, ollama_config, app_config
 
+# The agent (LangChain/Ollama) and executor are imported in _initialize so the
+# banner is on screen before their import cost is paid
+if TYPE_CHECKING:
+    from core.agent import DBMAAgent
+    from core.query_executor import QueryExecutor
+
 
 PROMPT_STYLE = Style.from_dict({
     "prompt": "ansigreen bold",
     "db": "ansicyan bold",
 })
 
+BANNER_TEMPLATE = """
+[bold #58a6ff]
+  ██████╗ ██████╗ ███╗   ███╗ █████╗ 
+  ██╔══██╗██╔══██╗████╗ ████║██╔══██╗
+  ██║  ██║██████╔╝██╔████╔██║███████║
+  ██║  ██║██╔══██╗██║╚██╔╝██║██╔══██║
+  ██████╔╝██████╔╝██║ ╚═╝ ██║██║  ██║
+  ╚═════╝ ╚═════╝ ╚═╝     ╚═╝╚═╝  ╚═╝
+[/bold #58a6ff][bold]  Database Management Agent v{version}[/bold]
+[dim]  Natural Language ↔ MySQL • Persistent Memory • Multi-DB[/dim]
+"""
+
+# Compiled once — matched on every user turn
+_USE_OR_SHOW_RE = re.compile(r"\buse\b|\bswitch\b|\bshow\s+database", re.IGNORECASE)
+_USE_RE = re.compile(r"^\s*USE\s+`?(\w+)`?\s*;?\s*$", re.IGNORECASE)
+
+# Leading keywords that route input straight to SQL execution
+_SQL_KEYWORDS = frozenset({
+    "SELECT", "INSERT", "UPDATE", "DELETE", "CREATE", "DROP", "ALTER",
+    "SHOW", "DESCRIBE", "DESC", "EXPLAIN", "TRUNCATE", "USE",
+    "BEGIN", "COMMIT", "ROLLBACK", "CALL", "GRANT", "REVOKE",
+})
+
+
+class CachedFileHistory(FileHistory):
+    """
+    FileHistory that keeps its entries in one oldest-first list.
+    get_strings() returns that list directly (no reversed copy) and new
+    entries are appended in O(1), so suggestions don't rebuild the
+    whole history on every keystroke.
+    """
+
+    def __init__(self, filename: str):
+        super().__init__(filename)
+        self._strings: List[str] = list(reversed(list(super().load_history_strings())))
+
+    def load_history_strings(self) -> Iterable[str]:
+        return reversed(self._strings)
+
+    def get_strings(self) -> List[str]:
+        return self._strings
+
+    def store_string(self, string: str) -> None:
+        self._strings.append(string)
+        super().store_string(string)
+
+
+class ReverseScanAutoSuggest(AutoSuggestFromHistory):
+    """
+    AutoSuggestFromHistory without the per-keystroke list() copy —
+    walks the history newest-first in place.
+    """
+
+    def get_suggestion(self, buffer, document):
+        text = document.text.rsplit("\n", 1)[-1]
+        if text.strip():
+            for string in reversed(buffer.history.get_strings()):
+                for line in reversed(string.splitlines()):
+                    if line.startswith(text):
+                        return Suggestion(line[len(text):])
+        return None
+
 
 class SimpleCLI:
     """
@@ -49,19 +115,44 @@ class SimpleCLI:
         self.console = Console()
         self.mysql = MySQLManager()
         self.persistence = PersistenceManager()
-        self.agent: Optional[DBMAAgent] = None
-        self.executor: Optional[QueryExecutor] = None
+        self.agent: Optional["DBMAAgent"] = None
+        self.executor: Optional["QueryExecutor"] = None
 
         self._current_db: Optional[str] = None
         self._current_thread_id: Optional[str] = None
         self._mode: str = "chat"  # "chat" or "sql"
         self._running: bool = True
 
+        # Banner formatted once; prompts cached per (database, mode) — bounded by #dbs × 2
+        self._banner: str = BANNER_TEMPLATE.format(version=app_config.version)
+        self._prompt_cache: Dict[Tuple[Optional[str], str], HTML] = {}
+
+        # /slash command dispatch — built once, looked up per command
+        self._commands: Dict[str, Callable[[str], None]] = {
+            "/exit": self._cmd_exit,
+            "/quit": self._cmd_exit,
+            "/help": self._cmd_help,
+            "/mode": self._cmd_mode,
+            "/use": self._cmd_use,
+            "/databases": self._cmd_dbs,
+            "/dbs": self._cmd_dbs,
+            "/tables": self._cmd_tables,
+            "/schema": self._cmd_schema,
+            "/refresh": self._cmd_refresh,
+            "/history": self._cmd_history,
+            "/sessions": self._cmd_sessions,
+            "/clear": self._cmd_clear,
+            "/version": self._cmd_version,
+        }
+
+        # Background pool for DB round-trips that shouldn't stall the prompt
+        self._pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix="dbma-cli")
+
         # Prompt toolkit session with history
         history_file = os.path.expanduser("~/.dbma_history")
         self.session = PromptSession(
-            history=FileHistory(history_file),
-            auto_suggest=AutoSuggestFromHistory(),
+            history=CachedFileHistory(history_file),
+            auto_suggest=ReverseScanAutoSuggest(),
         )
 
     def run(self):
@@ -87,6 +178,9 @@ class SimpleCLI:
 
     def _initialize(self):
         """Connect to databases and initialize agent."""
+        from core.agent import DBMAAgent
+        from core.query_executor import QueryExecutor
+
         self.console.print(f"[dim]Connecting to MySQL at {mysql_config.host}:{mysql_config.port}...[/dim]")
 
         if not self.mysql.connect():
@@ -94,6 +188,10 @@ class SimpleCLI:
             sys.exit(1)
         self.console.print("[green]✓ MySQL connected[/green]")
 
+        # SHOW DATABASES overlaps with PostgreSQL + agent setup below. Safe on the
+        # shared MySQL connection: nothing else touches MySQL until .result().
+        dbs_future = self._pool.submit(self.mysql.list_databases)
+
         self.console.print("[dim]Connecting to PostgreSQL persistence...[/dim]")
         if not self.persistence.connect():
             self.console.print("[yellow]⚠ PostgreSQL not connected — history won't persist[/yellow]")
@@ -105,30 +203,33 @@ class SimpleCLI:
         self.agent = DBMAAgent(self.mysql, self.persistence)
         self.executor = QueryExecutor(self.mysql, self.persistence, self.console)
 
-        self.console.print(f"[green]✓ DBMA Agent ready[/green] [dim](model: {ollama_config.model})[/dim]")
+        self.console.print(f"[green]✓ DBMA Agent ready[/green] [dim](model: {ollama_config.model_label})[/dim]")
         self.console.print()
         self.console.print("[dim]Type [bold]/help[/bold] for commands, or start talking to the agent.[/dim]")
         self.console.print()
 
         # List available databases
-        dbs = self.mysql.list_databases()
+        dbs = dbs_future.result()
         if dbs:
             self.console.print(f"[dim]Databases: {', '.join(dbs)}[/dim]")
             self.console.print("[dim]Say 'use <database_name>' to start working.[/dim]\n")
 
     def _get_input(self) -> Optional[str]:
         """Get input from user with context-aware prompt."""
-        db_part = f"[{self._current_db}]" if self._current_db else ""
-        mode_indicator = "💬" if self._mode == "chat" else "SQL"
+        key = (self._current_db, self._mode)
+        prompt_html = self._prompt_cache.get(key)
+        if prompt_html is None:
+            db_part = f"[{self._current_db}]" if self._current_db else ""
+            mode_indicator = "💬" if self._mode == "chat" else "SQL"
+            prompt_html = HTML(
+                f"<ansigreen><b>dbma{db_part}</b></ansigreen>"
+                f"<ansiyellow> {mode_indicator} </ansiyellow>"
+                f"<ansicyan>▶ </ansicyan>"
+            )
+            self._prompt_cache[key] = prompt_html
 
         try:
-            result = self.session.prompt(
-                HTML(
-                    f"<ansigreen><b>dbma{db_part}</b></ansigreen>"
-                    f"<ansiyellow> {mode_indicator} </ansiyellow>"
-                    f"<ansicyan>▶ </ansicyan>"
-                )
-            )
+            result = self.session.prompt(prompt_html)
             return result
         except KeyboardInterrupt:
             return ""
@@ -158,14 +259,20 @@ class SimpleCLI:
             self.console.print("[red]Agent not initialized[/red]")
             return
 
-        if not self._current_db and not re.search(r"\buse\b|\bswitch\b|\bshow\s+database", user_input, re.I):
+        if not self._current_db and not _USE_OR_SHOW_RE.search(user_input):
             self.console.print("[yellow]⚠ No database selected. Say 'use <database_name>' first.[/yellow]")
 
         self.console.print(f"[dim]Thinking...[/dim]")
 
+        # Stream the reply into a live panel as tokens arrive; it is replaced
+        # by the cleaned-up final answer once the agent finishes
+        streamed = Text()
+        live_panel = Panel(streamed, title="[bold green]DBMA[/bold green]", border_style="green")
+
         try:
             # ⚠️  LLM INTEGRATION REQUIRED
-            response = self.agent.chat(user_input)
+            with Live(live_panel, console=self.console, refresh_per_second=20, transient=True):
+                response = self.agent.chat(user_input, on_token=streamed.append)
         except Exception as e:
             self.console.print(f"[red]Agent error: {e}[/red]")
             return
@@ -179,6 +286,7 @@ class SimpleCLI:
         ))
 
         # Handle database switch
+        from core.agent import AgentIntent
         if response.intent == AgentIntent.SWITCH_DATABASE and response.metadata.get("target_database"):
             self._switch_database(response.metadata["target_database"])
             return
@@ -237,10 +345,9 @@ class SimpleCLI:
         result = self.executor.execute_and_format(sql, print_output=True)
 
         # Handle USE command
-        if sql.strip().upper().startswith("USE") and result.success:
-            db_match = re.search(r"USE\s+`?(\w+)`?", sql.strip(), re.IGNORECASE)
-            if db_match:
-                self._switch_database(db_match.group(1))
+        use_match = _USE_RE.match(sql)
+        if use_match and result.success:
+            self._switch_database(use_match.group(1))
 
     def _switch_database(self, db_name: str):
         """Switch to a different database."""
@@ -254,16 +361,17 @@ class SimpleCLI:
                 if self.executor:
                     self.executor.set_thread(thread_id)
 
-                # Show chat history count
-                msg_count = self.persistence.get_message_count(thread_id)
+            self.console.print(
+                f"[green]Database changed to[/green] [bold #58a6ff]{db_name}[/bold #58a6ff]"
+            )
+
+            # Show chat history count — already counted by set_database_context
+            if self.agent:
+                msg_count = self.agent.history_message_count
                 if msg_count > 0:
                     self.console.print(
                         f"[dim]Loaded {msg_count} previous messages for `{db_name}`[/dim]"
                     )
-
-            self.console.print(
-                f"[green]Database changed to[/green] [bold #58a6ff]{db_name}[/bold #58a6ff]"
-            )
         else:
             self.console.print(f"[red]Failed: {result.error}[/red]")
 
@@ -273,88 +381,78 @@ class SimpleCLI:
         cmd = parts[0].lower()
         arg = parts[1] if len(parts) > 1 else ""
 
-        if cmd == "/exit" or cmd == "/quit":
-            self._running = False
+        handler = self._commands.get(cmd)
+        if handler is None or (cmd == "/use" and not arg):
+            self.console.print(f"[yellow]Unknown command: {command}. Type /help[/yellow]")
+            return
+        handler(arg)
 
-        elif cmd == "/help":
-            if self.agent:
-                self.console.print(self.agent._get_help_text())
+    # ── /slash command handlers ──────────────────────────────
 
-        elif cmd == "/mode":
-            self._mode = "sql" if self._mode == "chat" else "chat"
-            self.console.print(f"[dim]Switched to {self._mode.upper()} mode[/dim]")
+    def _cmd_exit(self, arg: str):
+        self._running = False
 
-        elif cmd == "/use" and arg:
-            self._switch_database(arg)
+    def _cmd_help(self, arg: str):
+        if self.agent:
+            self.console.print(self.agent._get_help_text())
 
-        elif cmd == "/databases" or cmd == "/dbs":
-            self._execute_sql("SHOW DATABASES")
+    def _cmd_mode(self, arg: str):
+        self._mode = "sql" if self._mode == "chat" else "chat"
+        self.console.print(f"[dim]Switched to {self._mode.upper()} mode[/dim]")
 
-        elif cmd == "/tables":
-            if self._current_db:
-                self._execute_sql(f"SHOW TABLES FROM `{self._current_db}`")
+    def _cmd_use(self, arg: str):
+        self._switch_database(arg)
 
-        elif cmd == "/schema":
-            if self.agent and self.agent.schema_summary:
-                self.console.print(self.agent.schema_summary)
+    def _cmd_dbs(self, arg: str):
+        self._execute_sql("SHOW DATABASES")
 
-        elif cmd == "/refresh":
-            if self.agent:
-                self.agent.refresh_schema_force()
-                self.console.print("[green]Schema refreshed[/green]")
-
-        elif cmd == "/history":
-            if self._current_thread_id:
-                history = self.persistence.get_query_history(self._current_thread_id, limit=20)
-                if history:
-                    for i, q in enumerate(history, 1):
-                        status = "[green]✓[/green]" if q["success"] else "[red]✗[/red]"
-                        self.console.print(f"  {i}. {status} {q['sql_query'][:80]}")
-
-        elif cmd == "/sessions":
-            sessions = self.persistence.list_sessions()
-            for s in sessions:
-                self.console.print(
-                    f"  • {s['mysql_db_name']} ({s.get('message_count', 0)} messages)"
-                )
-
-        elif cmd == "/clear":
-            os.system("clear" if os.name != "nt" else "cls")
-
-        elif cmd == "/version":
-            self.console.print(f"DBMA v{app_config.version}")
+    def _cmd_tables(self, arg: str):
+        if self._current_db:
+            self._execute_sql(f"SHOW TABLES FROM `{self._current_db}`")
+
+    def _cmd_schema(self, arg: str):
+        if self.agent and self.agent.schema_summary:
+            self.console.print(self.agent.schema_summary)
+
+    def _cmd_refresh(self, arg: str):
+        if self.agent:
+            self.agent.refresh_schema_force()
+            self.console.print("[green]Schema refreshed[/green]")
+
+    def _cmd_history(self, arg: str):
+        if self._current_thread_id:
+            history = self.persistence.get_query_history(self._current_thread_id, limit=20)
+            if history:
+                for i, q in enumerate(history, 1):
+                    status = "[green]✓[/green]" if q["success"] else "[red]✗[/red]"
+                    self.console.print(f"  {i}. {status} {q['sql_query'][:80]}")
+
+    def _cmd_sessions(self, arg: str):
+        sessions = self.persistence.list_sessions()
+        for s in sessions:
+            self.console.print(
+                f"  • {s['mysql_db_name']} ({s.get('message_count', 0)} messages)"
+            )
 
-        else:
-            self.console.print(f"[yellow]Unknown command: {command}. Type /help[/yellow]")
+    def _cmd_clear(self, arg: str):
+        self.console.clear()
+
+    def _cmd_version(self, arg: str):
+        self.console.print(f"DBMA v{app_config.version}")
 
     def _looks_like_sql(self, text: str) -> bool:
         """Quick check if input looks like direct SQL."""
-        sql_keywords = {
-            "SELECT", "INSERT", "UPDATE", "DELETE", "CREATE", "DROP", "ALTER",
-            "SHOW", "DESCRIBE", "DESC", "EXPLAIN", "TRUNCATE", "USE",
-            "BEGIN", "COMMIT", "ROLLBACK", "CALL", "GRANT", "REVOKE",
-        }
-        first_word = text.split()[0].upper() if text.split() else ""
-        return first_word in sql_keywords
+        parts = text.split(None, 1)
+        return bool(parts) and parts[0].upper() in _SQL_KEYWORDS
 
     def _print_banner(self):
         """Print the ASCII art banner."""
-        banner = """
-[bold #58a6ff]
-  ██████╗ ██████╗ ███╗   ███╗ █████╗ 
-  ██╔══██╗██╔══██╗████╗ ████║██╔══██╗
-  ██║  ██║██████╔╝██╔████╔██║███████║
-  ██║  ██║██╔══██╗██║╚██╔╝██║██╔══██║
-  ██████╔╝██████╔╝██║ ╚═╝ ██║██║  ██║
-  ╚═════╝ ╚═════╝ ╚═╝     ╚═╝╚═╝  ╚═╝
-[/bold #58a6ff][bold]  Database Management Agent v{version}[/bold]
-[dim]  Natural Language ↔ MySQL • Persistent Memory • Multi-DB[/dim]
-""".format(version=app_config.version)
-        self.console.print(banner)
+        self.console.print(self._banner)
 
     def _shutdown(self):
         """Clean up on exit."""
         self.console.print("\n[dim]Shutting down DBMA...[/dim]")
+        self._pool.shutdown(wait=True)
         self.mysql.disconnect()
         self.persistence.disconnect()
         self.console.print("[green]Goodbye![/green]")
@@ -23,12 +23,17 @@
 #
 #   FIX 6 — query-input-area: CSS height fixed to 5 — never expands/breaks
 #
-#   FIX 7 — _initialize:      Moved to @work(thread=True) def — not async
+#   FIX 7 — _initialize:      Async worker — blocking connects run via
+#                              asyncio.to_thread, MySQL + PostgreSQL in parallel
 # ============================================================
 
 import re
+import asyncio
+import functools
+import time
+from collections import OrderedDict, deque
 from pathlib import Path
-from typing import Optional
+from typing import Optional, List, Tuple
 from datetime import datetime
 
 from textual.app import App, ComposeResult
@@ -38,13 +43,49 @@ from textual.reactive import reactive
 from textual.message import Message
 from textual.screen import ModalScreen
 from textual import work
+from textual.worker import get_current_worker
 from loguru import logger
 
 from core.mysql_manager import MySQLManager
-from core.persistence import PersistenceManager
-from core.agent import DBMAAgent, AgentResponse, AgentIntent
+from core.persistence import PersistenceManager, ChatMessage
+from core.agent import DBMAAgent, AgentResponse, AgentIntent, AgentCancelled
 from core.query_executor import QueryExecutor
-from config import mysql_config, app_config
+from config import mysql_config, app_config, ollama_config
+
+# Compiled once — used on every executed statement / rendered bubble
+_USE_RE = re.compile(r"USE\s+`?(\w+)`?", re.IGNORECASE)
+_BRACKET_TABLE = str.maketrans({"[": "\\["})
+_WS_RE = re.compile(r"\s+")
+
+_DESTRUCTIVE_KEYWORDS = frozenset({"DELETE", "DROP", "TRUNCATE"})
+_AUTO_EXEC_KEYWORDS = frozenset({"SHOW", "DESCRIBE", "DESC", "EXPLAIN"})
+_FIRST_WORD_RE = re.compile(r"\s*(\S+)")
+
+
+def _first_keyword(sql: str) -> str:
+    """Upper-cased first word of a SQL string — anchored match, no copy of the statement."""
+    match = _FIRST_WORD_RE.match(sql)
+    return match.group(1).upper() if match else ""
+
+
+# ── Worker → App messages ─────────────────────────────────────
+# Fire-and-forget UI updates from worker threads. post_message doesn't block
+# the worker (call_from_thread waits for the main thread to run the callback),
+# and queued messages are handled together in the app's next tick.
+class LoadingState(Message):
+    """Toggle the chat panel's thinking indicator."""
+
+    def __init__(self, is_loading: bool) -> None:
+        self.is_loading = is_loading
+        super().__init__()
+
+
+class QueryOutput(Message):
+    """Append lines to the query output panel."""
+
+    def __init__(self, lines: List[str]) -> None:
+        self.lines = lines
+        super().__init__()
 
 
 # ── Confirmation Modal ────────────────────────────────────────
@@ -103,6 +144,21 @@ class DestructiveConfirmModal(ModalScreen):
 
 
 # ── Chat Bubble ───────────────────────────────────────────────
+# Per-role label markup and CSS class — unknown roles render as the agent
+_ROLE_LABELS = {
+    "human":     "[bold #58a6ff]You ▶[/bold #58a6ff]",
+    "system":    "[bold #f0883e]System ℹ[/bold #f0883e]",
+    "error":     "[bold #f85149]Error ✗[/bold #f85149]",
+    "assistant": "[bold #3fb950]DBMA ◆[/bold #3fb950]",
+}
+_ROLE_CSS = {
+    "human":     "chat-bubble-human",
+    "assistant": "chat-bubble-agent",
+    "system":    "chat-bubble-system",
+    "error":     "chat-bubble-error",
+}
+
+
 class ChatBubble(Static):
     """
     A single chat message bubble.
@@ -114,35 +170,37 @@ class ChatBubble(Static):
         self._role = role
 
         # Build display text once — immutable after this
-        if role == "human":
-            label = "[bold #58a6ff]You ▶[/bold #58a6ff]"
-        elif role == "system":
-            label = "[bold #f0883e]System ℹ[/bold #f0883e]"
-        elif role == "error":
-            label = "[bold #f85149]Error ✗[/bold #f85149]"
-        else:
-            label = "[bold #3fb950]DBMA ◆[/bold #3fb950]"
+        label = _ROLE_LABELS.get(role, _ROLE_LABELS["assistant"])
 
         # Escape user content to prevent markup rendering glitches
-        safe = content.replace("[", "\\[") if role == "human" else content
+        safe = content.translate(_BRACKET_TABLE) if role == "human" else content
 
         display = f"{label}\n{safe}"
 
         if sql:
-            safe_sql = sql.replace("[", "\\[")
+            safe_sql = sql.translate(_BRACKET_TABLE)
             display += f"\n\n[dim]Generated SQL:[/dim]\n[bold #79c0ff]{safe_sql}[/bold #79c0ff]"
 
         # Pass fully built string to Static — never call update() after this
         super().__init__(display, **kwargs)
+        self._display = display
+        self._last_len = len(display)   # length last passed to update()
 
         # CSS class
-        css_map = {
-            "human":     "chat-bubble-human",
-            "assistant": "chat-bubble-agent",
-            "system":    "chat-bubble-system",
-            "error":     "chat-bubble-error",
-        }
-        self.add_class(css_map.get(role, "chat-bubble-agent"))
+        self.add_class(_ROLE_CSS.get(role, "chat-bubble-agent"))
+
+    def append_text(self, chunk: str) -> None:
+        """
+        Append escaped text — ONLY for the transient in-progress agent bubble,
+        which is removed once the final response bubble is mounted.
+        Skips the re-render when the content length hasn't changed.
+        """
+        new = self._display + chunk.translate(_BRACKET_TABLE)
+        if len(new) == self._last_len:
+            return
+        self._display = new
+        self._last_len = len(new)
+        self.update(new)
 
 
 # ── Main DBMA TUI Application ─────────────────────────────────
@@ -173,6 +231,17 @@ class DBMAApp(App):
     is_connected     = reactive(False)
     query_count      = reactive(0)
     is_agent_thinking = reactive(False)
+    unread_count     = reactive(0)
+
+    # History messages fetched + mounted per page — older pages load on scroll-to-top
+    CHAT_WINDOW = 40
+
+    # Threads whose loaded history is kept in memory for instant revisits (LRU)
+    HISTORY_CACHE_THREADS = 8
+
+    # Query-output lines written per 50 ms tick — short pieces all go out in
+    # one write, a large result (posted as ~200-row pieces) spans several frames
+    OUTPUT_LINES_PER_TICK = 400
 
     def __init__(self):
         super().__init__()
@@ -182,10 +251,67 @@ class DBMAApp(App):
         self.agent:          Optional[DBMAAgent]     = None
         self._current_thread_id: Optional[str] = None
 
+        # Virtualized chat history — only a window of bubbles is mounted
+        self._history_messages: List[ChatMessage] = []
+        self._history_start: int = 0                  # oldest mounted index
+        self._history_anchor: Optional[ChatBubble] = None
+        self._history_paging: bool = False
+        self._history_exhausted: bool = True         # no older rows in PostgreSQL
+
+        # Loaded history of recently left threads — thread_id → (messages, exhausted).
+        # A thread with a chat turn since it was loaded is dirty and not cached.
+        self._history_cache: "OrderedDict[str, Tuple[List[ChatMessage], bool]]" = OrderedDict()
+        self._history_thread_id: Optional[str] = None
+        self._history_dirty: bool = False
+        # Bumped whenever the loaded history is replaced (switch, /clear) —
+        # page mounts and fetches from an older generation leave state alone
+        self._history_generation: int = 0
+
+        # In-progress agent reply: the worker appends tokens to the deque and
+        # a 50 ms timer moves them into the streaming bubble in one update
+        self._stream_tokens: deque = deque()
+        self._stream_bubble: Optional[ChatBubble] = None
+        self._stream_held: bool = False    # not mounted yet — reader is scrolled up
+        self._stream_timer = None
+
+        # Bubbles that arrived while the reader was scrolled up — mounted on return
+        self._pending_bubbles: List[ChatBubble] = []
+
+        # Query-output pieces coalesced into one RichLog.write per tick
+        self._out_buffer: deque = deque()
+
+        # Status bar is redrawn by a 10 Hz timer, only when marked dirty
+        self._status_dirty: bool = True
+        self._status_rendered: tuple = ("", "")
+        self._last_time_epoch: int = -1      # HH:MM:SS is re-formatted once per second
+        self._last_time_str: str = ""
+
     # ── App Lifecycle ─────────────────────────────────────────
 
     def on_mount(self) -> None:
         """Called when app starts."""
+        # Hot-path widgets resolved once — avoids a selector walk per update
+        self._query_output     = self.query_one("#query-output", RichLog)
+        self._chat_container   = self.query_one("#chat-messages", ScrollableContainer)
+        self._status_left      = self.query_one("#status-left", Label)
+        self._status_right     = self.query_one("#status-right", Label)
+        self._header_db_badge  = self.query_one("#header-db-badge", Label)
+        self._query_prompt_db  = self.query_one("#query-prompt-db", Label)
+        self._chat_input_label = self.query_one("#chat-input-label", Label)
+        self._chat_header      = self.query_one("#chat-panel-header", Label)
+        self._chat_input       = self.query_one("#chat-input", Input)
+        self._query_input      = self.query_one("#query-input", Input)
+
+        self.watch(
+            self._chat_container,
+            "scroll_y",
+            self._on_chat_scroll,
+            init=False,
+        )
+        self.set_interval(
+            0.05, functools.partial(self._flush_out_buffer, self.OUTPUT_LINES_PER_TICK)
+        )
+        self.set_interval(0.1, self._maybe_flush_status)
         self._initialize()
 
     def on_mouse_down(self, event) -> None:
@@ -197,55 +323,71 @@ class DBMAApp(App):
         """
         event.stop()   # stop propagation — app owns this event, not the terminal
 
-    @work(thread=True, exclusive=True)
-    def _initialize(self):
+    @work(exclusive=True)
+    async def _initialize(self):
         """
-        FIX 7: Background thread initialization — UI stays responsive.
-        Was: async def _initialize() run via run_worker(coroutine)
-        Now: @work(thread=True) def — true background thread
+        FIX 7: Background initialization — UI stays responsive.
+        Runs as an async worker on the event loop; every blocking call goes
+        through asyncio.to_thread. MySQL and PostgreSQL connect concurrently,
+        so startup waits for the slower of the two rather than their sum.
         """
         self._sys("Initializing DBMA...")
 
-        # Connect MySQL
+        # Connect MySQL + PostgreSQL in parallel
         self._sys(f"Connecting to MySQL at {mysql_config.host}:{mysql_config.port}...")
-        if self.mysql_manager.connect():
-            self.call_from_thread(setattr, self, "is_connected", True)
+        self._sys("Connecting to PostgreSQL persistence...")
+        mysql_ok, pg_ok = await asyncio.gather(
+            asyncio.to_thread(self.mysql_manager.connect),
+            asyncio.to_thread(self.persistence.connect),
+        )
+
+        if mysql_ok:
+            self.is_connected = True
             self._sys("✓ MySQL connected successfully", "success")
         else:
             self._sys("✗ MySQL connection failed! Check your .env", "error")
             return
 
-        # Connect PostgreSQL
-        self._sys("Connecting to PostgreSQL persistence...")
-        if self.persistence.connect():
-            self.persistence.initialize_schema()
+        if pg_ok:
+            await asyncio.to_thread(self.persistence.initialize_schema)
             self._sys("✓ PostgreSQL persistence connected", "success")
         else:
             self._sys("✗ PostgreSQL failed! Chat history won't persist.", "warning")
 
-        # Init Agent + Executor
-        self.agent          = DBMAAgent(self.mysql_manager, self.persistence)
+        # Init Agent + Executor (agent construction probes LangSmith — off the loop;
+        # it only builds the Ollama client and does not check Ollama is reachable)
+        self.agent          = await asyncio.to_thread(DBMAAgent, self.mysql_manager, self.persistence)
         self.query_executor = QueryExecutor(self.mysql_manager, self.persistence)
 
-        self._sys(f"✓ DBMA Agent ready (Model: {self.agent._llm.model if self.agent._llm else 'N/A'})", "success")
-
         # List databases
-        dbs = self.mysql_manager.list_databases()
-        if dbs:
-            self.call_from_thread(
-                self._print_to_query_output,
-                f"[dim]Available databases: {', '.join(dbs)}[/dim]"
+        dbs = await asyncio.to_thread(self.mysql_manager.list_databases)
+
+        # Everything the user sees at the end of startup lands in one tick
+        self._apply_init_state({
+            "agent_line": (
+                f"✓ DBMA Agent ready (Model: {ollama_config.model_label if self.agent._llm else 'N/A'})"
+            ),
+            "dbs": dbs,
+            "welcome": self._get_welcome_message(),
+        })
+
+    def _apply_init_state(self, state: dict) -> None:
+        """
+        Apply the end-of-startup UI updates together: agent/database lines in
+        one output write, welcome bubble, status bar and input focus.
+        """
+        self._sys(state["agent_line"], "success")
+        if state["dbs"]:
+            self._print_to_query_output(
+                f"[dim]Available databases: {', '.join(state['dbs'])}[/dim]"
             )
+        self._flush_out_buffer()
 
         # Welcome chat bubble
-        self.call_from_thread(
-            self._add_chat_bubble,
-            "system",
-            self._get_welcome_message(),
-        )
+        self._add_chat_bubble("system", state["welcome"])
 
-        self.call_from_thread(self._update_status_bar)
-        self.call_from_thread(lambda: self.query_one("#chat-input").focus())
+        self._status_dirty = True
+        self._chat_input.focus()
 
     def compose(self) -> ComposeResult:
         """Build the UI layout."""
@@ -341,7 +483,8 @@ class DBMAApp(App):
 
         # Show human bubble immediately
         self._add_chat_bubble("human", user_input)
-        self._update_status_bar()
+        self._status_dirty = True
+        self._history_dirty = True   # persisted turn isn't in the loaded history
 
         if not self.agent:
             self._add_chat_bubble("error", "⚠️ Agent not initialized — please wait...")
@@ -350,23 +493,51 @@ class DBMAApp(App):
         # Show thinking
         self.is_agent_thinking = True
         self._update_loading_state(True)
+        self._start_stream()
 
         # FIX 1: true background thread — UI never freezes
         self._run_agent(user_input)
 
-    @work(thread=True, exclusive=False)
+    @work(thread=True, exclusive=True, group="agent")
     def _run_agent(self, user_input: str):
         """
         FIX 1: @work(thread=True) def — Ollama call in real background thread.
         Was: async def called via run_worker (still blocked event loop).
         Now: Plain def decorated with @work(thread=True) — truly non-blocking.
         The LLM (Ollama) can take seconds — this keeps UI alive during that time.
+
+        Exclusive in the "agent" group: a new prompt cancels the one in flight.
+        A thread can't be interrupted, so the next streamed token — or the
+        agent's check right before it saves the turn — raises AgentCancelled
+        and the stale turn is abandoned unsaved. Once chat() has returned the
+        turn is already in history, so its reply is shown even if cancelled.
         """
+        worker = get_current_worker()
+        bubble = self._stream_bubble
+        tokens = self._stream_tokens
+
+        def on_token(token: str) -> None:
+            if worker.is_cancelled:
+                raise AgentCancelled()
+            # Queued without a thread hop — drained by _flush_stream_buf
+            tokens.append(token)
+
         try:
             # This blocking call lives entirely in its own thread
-            response: AgentResponse = self.agent.chat(user_input)
+            response: AgentResponse = self.agent.chat(
+                user_input,
+                on_token=on_token,
+                is_cancelled=lambda: worker.is_cancelled,
+            )
             # Return to main UI thread to update display
+            self.call_from_thread(self._end_stream, bubble)
             self.call_from_thread(self._handle_agent_response, response)
+        except AgentCancelled:
+            self.call_from_thread(
+                self._add_chat_bubble,
+                "system",
+                "⏹ Previous request cancelled — answering your latest message.",
+            )
         except Exception as e:
             logger.error(f"Agent error: {e}")
             self.call_from_thread(
@@ -376,9 +547,11 @@ class DBMAApp(App):
                 f"And model is pulled: ollama pull llama3.1:8b",
             )
         finally:
-            # Always restore UI state
-            self.call_from_thread(self._update_loading_state, False)
-            self.is_agent_thinking = False
+            # Always restore UI state — unless a newer request now owns it
+            self.call_from_thread(self._end_stream, bubble)
+            if not worker.is_cancelled:
+                self.post_message(LoadingState(False))
+                self.is_agent_thinking = False
 
     def _handle_agent_response(self, response: AgentResponse) -> None:
         """
@@ -406,10 +579,10 @@ class DBMAApp(App):
             # to execute correctly — MySQL accepts single-line SQL perfectly.
             # ─────────────────────────────────────────────────────────────────────
             raw_sql = response.sql_query or ""
-            single_line_sql = " ".join(raw_sql.split())   # collapses ALL whitespace/newlines
+            single_line_sql = _WS_RE.sub(" ", raw_sql).strip()   # collapses ALL whitespace/newlines
 
             try:
-                qi = self.query_one("#query-input", Input)
+                qi = self._query_input
                 qi.value = single_line_sql                 # ← single line, never breaks layout
                 qi.focus()
             except Exception as e:
@@ -424,16 +597,14 @@ class DBMAApp(App):
             # Auto-execute ONLY for truly read-only: SHOW DATABASES / SHOW TABLES
             # Everything else (CREATE, INSERT, UPDATE, DELETE) waits for user Enter
             if response.auto_execute and not response.requires_confirmation:
-                first = single_line_sql.strip().split()[0].upper() if single_line_sql.strip() else ""
-                if first in ("SHOW", "DESCRIBE", "DESC", "EXPLAIN"):
+                if _first_keyword(single_line_sql) in _AUTO_EXEC_KEYWORDS:
                     self._execute_sql(single_line_sql)
 
     # ── Query Execution ───────────────────────────────────────
 
     def _handle_query_execution(self, sql: str) -> None:
         """Execute SQL typed or confirmed in the query input."""
-        first = sql.strip().split()[0].upper() if sql.strip() else ""
-        if first in ("DELETE", "DROP", "TRUNCATE"):
+        if _first_keyword(sql) in _DESTRUCTIVE_KEYWORDS:
             self.push_screen(
                 DestructiveConfirmModal(
                     sql,
@@ -458,27 +629,28 @@ class DBMAApp(App):
             return
 
         # Echo query to output panel
-        self.call_from_thread(
-            self._print_to_query_output,
+        self.post_message(QueryOutput([
             f"\n[dim #58a6ff]mysql [{self.current_db}]>[/dim #58a6ff] [bold]{sql}[/bold]",
-        )
+        ]))
 
         # Execute via executor
         result = self.query_executor.execute_and_format(sql, print_output=False)
 
         # Handle USE <db> — switch context
         if sql.strip().upper().startswith("USE") and result.success:
-            m = re.search(r"USE\s+`?(\w+)`?", sql.strip(), re.IGNORECASE)
+            m = _USE_RE.search(sql.strip())
             if m:
                 self.call_from_thread(self._switch_to_database_context, m.group(1))
 
         # Print result
-        formatted = self.query_executor.format_result_as_text(result)
-        self.call_from_thread(self._print_to_query_output, formatted)
+        # Handed over in pieces of ~200 rows instead of one big string; the
+        # flush timer writes up to OUTPUT_LINES_PER_TICK lines per frame
+        for chunk in self.query_executor.format_result_as_text_chunks(result):
+            self.post_message(QueryOutput([chunk]))
 
         # Increment query counter
         self.query_count += 1
-        self.call_from_thread(self._update_status_bar)
+        self._status_dirty = True
 
         # Save to query history
         if self._current_thread_id:
@@ -502,10 +674,9 @@ class DBMAApp(App):
              actually run in a thread, they run on the event loop.
         Now: @work(thread=True) def — called directly, truly non-blocking.
         """
-        self.call_from_thread(
-            self._print_to_query_output,
+        self.post_message(QueryOutput([
             f"\n[dim]Switching to database [bold #58a6ff]{db_name}[/bold #58a6ff]...[/dim]",
-        )
+        ]))
 
         result = self.mysql_manager.use_database(db_name)
         if not result.success:
@@ -531,23 +702,18 @@ class DBMAApp(App):
         self.current_db = db_name
 
         # Update header badge
-        try:
-            self.query_one("#header-db-badge", Label).update(f" ◆ {db_name} ")
-        except Exception:
-            pass
+        self._header_db_badge.update(f" ◆ {db_name} ")
 
         # Update query prompt
-        try:
-            self.query_one("#query-prompt-db", Label).update(f" [{db_name}]")
-        except Exception:
-            pass
+        self._query_prompt_db.update(f" [{db_name}]")
 
         # Reload chat history for this database
         self._load_chat_history_to_panel()
-        self._update_status_bar()
+        self._status_dirty = True
 
         self._print_to_query_output(
-            f"[green]Database changed to[/green] [bold #58a6ff]{db_name}[/bold #58a6ff]"
+            f"[green]Database changed to[/green] [bold #58a6ff]{db_name}[/bold #58a6ff]",
+            flush=True,
         )
 
     def _load_chat_history_to_panel(self) -> None:
@@ -555,8 +721,9 @@ class DBMAApp(App):
         if not self._current_thread_id:
             return
 
+        container = self._chat_container
+        self._drop_pending_bubbles()
         try:
-            container = self.query_one("#chat-messages", ScrollableContainer)
             container.remove_children()
         except Exception:
             return
@@ -573,30 +740,39 @@ class DBMAApp(App):
         except Exception:
             pass
 
-        # Load saved messages from PostgreSQL
-        messages = self.persistence.load_chat_history(
-            self._current_thread_id,
-            limit=app_config.max_chat_history,
-        )
+        # Park the thread we're leaving, then reuse the target's cached history
+        self._cache_current_history()
+        cached = self._history_cache.pop(self._current_thread_id, None)
+        if cached is not None:
+            messages, exhausted = cached
+        else:
+            # Load the newest page of saved messages from PostgreSQL — older
+            # pages are fetched by keyset cursor as the user scrolls up
+            page_size = min(self.CHAT_WINDOW, app_config.max_chat_history)
+            messages = self.persistence.load_chat_history(
+                self._current_thread_id,
+                limit=page_size,
+            )
+            exhausted = len(messages) < page_size
+
+        self._history_thread_id = self._current_thread_id
+        self._history_generation += 1
+        self._history_dirty = False
+        self._history_messages = messages
+        self._history_start = len(messages)
+        self._history_anchor = None
+        self._history_exhausted = exhausted
+        self._history_paging = False   # an in-flight page for the old thread is dropped
 
         if messages:
-            for msg in messages:
-                try:
-                    container.mount(
-                        ChatBubble(
-                            role=msg.role,
-                            content=msg.content,
-                            sql=msg.sql_query,
-                        )
-                    )
-                except Exception:
-                    pass
-            try:
-                container.scroll_end(animate=False)
-            except Exception:
-                pass
+            # Only the newest CHAT_WINDOW bubbles are mounted, one frame later
+            # so the switch itself isn't blocked; the rest mount on scroll-up
+            self._history_paging = True
+            self.call_later(self._mount_older_history, self._history_generation, True)
+            # messages is only the newest page — report the thread's saved total
+            total = self.agent.history_message_count if self.agent else len(messages)
             self._print_to_query_output(
-                f"[dim]Loaded {len(messages)} previous messages for `{self.current_db}`[/dim]"
+                f"[dim]Loaded {total} previous messages for `{self.current_db}`[/dim]"
             )
         else:
             try:
@@ -610,6 +786,132 @@ class DBMAApp(App):
             except Exception:
                 pass
 
+    def _cache_current_history(self) -> None:
+        """Keep the outgoing thread's loaded messages unless a chat turn made them stale."""
+        thread_id = self._history_thread_id
+        if thread_id is None or self._history_dirty:
+            return
+        self._history_cache[thread_id] = (self._history_messages, self._history_exhausted)
+        self._history_cache.move_to_end(thread_id)
+        while len(self._history_cache) > self.HISTORY_CACHE_THREADS:
+            self._history_cache.popitem(last=False)
+
+    def _on_chat_scroll(self, scroll_y: float) -> None:
+        """
+        Mount the next page of older history when the chat hits the top,
+        and any held-back new bubbles when it returns to the bottom.
+        """
+        if self._pending_bubbles and self._chat_at_bottom():
+            self._flush_pending_bubbles()
+        has_older = self._history_start > 0 or not self._history_exhausted
+        if scroll_y <= 0 and has_older and not self._history_paging:
+            self._history_paging = True
+            if self._history_start > 0:
+                self.call_later(self._mount_older_history, self._history_generation)
+            else:
+                self._load_older_history()
+
+    async def _mount_older_history(self, generation: int, scroll_end: bool = False) -> None:
+        """Mount up to CHAT_WINDOW loaded history bubbles above the oldest mounted one."""
+        # Scheduled before a switch / clear — the new history owns paging now
+        if generation != self._history_generation:
+            return
+        container = self._chat_container
+
+        start = max(0, self._history_start - self.CHAT_WINDOW)
+        anchor = self._history_anchor
+        bubbles = [
+            ChatBubble(role=msg.role, content=msg.content, sql=msg.sql_query)
+            for msg in self._history_messages[start:self._history_start]
+        ]
+        self._history_start = start
+        if bubbles:
+            self._history_anchor = bubbles[0]
+
+        # One mount_all → one layout pass for the whole page
+        try:
+            if anchor is None:
+                await container.mount_all(bubbles)
+            else:
+                await container.mount_all(bubbles, before=anchor)
+        except Exception as e:
+            logger.debug(f"_mount_older_history: {e}")
+            return
+        finally:
+            if generation == self._history_generation:
+                self._history_paging = False
+
+        # Keep the reader where they were: bottom on first load, else the old
+        # top. Widget regions are only current after the next layout pass.
+        def restore_position() -> None:
+            try:
+                if scroll_end:
+                    container.scroll_end(animate=False)
+                elif anchor is not None:
+                    container.scroll_to_widget(anchor, animate=False, top=True)
+            except Exception:
+                pass
+
+        self.call_after_refresh(restore_position)
+
+    def _load_older_history(self) -> None:
+        """
+        Fetch the next page of messages older than the oldest loaded one in a
+        worker thread. Stops at app_config.max_chat_history.
+        """
+        remaining = app_config.max_chat_history - len(self._history_messages)
+        if self._history_exhausted or remaining <= 0 or not self._history_messages:
+            self._history_exhausted = True
+            self._history_paging = False
+            return
+
+        self._fetch_older_history(
+            self._history_thread_id,
+            self._history_generation,
+            self._history_messages[0].sequence_no,
+            min(self.CHAT_WINDOW, remaining),
+        )
+
+    @work(thread=True, exclusive=True, group="history")
+    def _fetch_older_history(self, thread_id: str, generation: int, before_seq: int, limit: int) -> None:
+        """Keyset page from PostgreSQL off the event loop, mounted on the main thread."""
+        try:
+            older = self.persistence.load_chat_history(
+                thread_id,
+                limit=limit,
+                before_seq=before_seq,
+            )
+        except Exception as e:
+            logger.debug(f"_fetch_older_history: {e}")
+            older = None
+        self.call_from_thread(self._prepend_older_history, generation, before_seq, limit, older)
+
+    async def _prepend_older_history(
+        self,
+        generation: int,
+        before_seq: int,
+        limit: int,
+        older: Optional[List[ChatMessage]],
+    ) -> None:
+        """Add a fetched page in front of the loaded history and mount it."""
+        # Dropped if the chat switched threads or was cleared (the new history owns paging now)
+        if generation != self._history_generation:
+            return
+        # ...or if the fetch failed
+        stale = not self._history_messages or self._history_messages[0].sequence_no != before_seq
+        if stale or older is None:
+            self._history_paging = False
+            return
+
+        self._history_exhausted = len(older) < limit
+        if not older:
+            self._history_paging = False
+            return
+
+        self._history_messages[:0] = older
+        self._history_start += len(older)
+        await self._mount_older_history(generation)
+
     # ── Slash Commands ────────────────────────────────────────
 
     def _handle_slash_command(self, command: str) -> None:
@@ -658,10 +960,14 @@ class DBMAApp(App):
         elif cmd == "/clear":
             if self._current_thread_id:
                 self.persistence.clear_thread(self._current_thread_id)
-                try:
-                    self.query_one("#chat-messages", ScrollableContainer).remove_children()
-                except Exception:
-                    pass
+                self._history_generation += 1
+                self._history_paging = False
+                self._history_messages = []
+                self._history_start = 0
+                self._history_anchor = None
+                self._history_exhausted = True
+                self._drop_pending_bubbles()
+                self._chat_container.remove_children()
                 self._add_chat_bubble("system", "✓ Chat history cleared for this database.")
 
         elif cmd in ("/databases", "/dbs"):
@@ -700,10 +1006,37 @@ class DBMAApp(App):
 
     # ── UI Helpers ────────────────────────────────────────────
 
-    def _print_to_query_output(self, text: str) -> None:
-        """Write text to the left query output panel."""
+    def _print_to_query_output(self, text: str, flush: bool = False) -> None:
+        """
+        Queue text for the left query output panel. Queued lines are written
+        together every 50 ms; flush=True writes immediately.
+        """
+        self._out_buffer.append(text)
+        if flush:
+            self._flush_out_buffer()
+
+    def _flush_out_buffer(self, max_lines: Optional[int] = None) -> None:
+        """
+        Write queued query-output pieces in a single RichLog.write — whole
+        pieces up to `max_lines` lines (the timer tick; always at least one
+        piece), or everything when max_lines is None.
+        """
+        buf = self._out_buffer
+        if not buf:
+            return
+        if max_lines is None:
+            text = "\n".join(buf)
+            buf.clear()
+        else:
+            pieces = [buf.popleft()]
+            lines = pieces[0].count("\n") + 1
+            while buf and lines + buf[0].count("\n") < max_lines:
+                piece = buf.popleft()
+                pieces.append(piece)
+                lines += piece.count("\n") + 1
+            text = "\n".join(pieces)
         try:
-            self.query_one("#query-output", RichLog).write(text)
+            self._query_output.write(text)
         except Exception as e:
             logger.debug(f"_print_to_query_output: {e}")
 
@@ -713,22 +1046,115 @@ class DBMAApp(App):
         content: str,
         sql: Optional[str] = None,
         error: bool = False,
-    ) -> None:
+    ) -> Optional[ChatBubble]:
         """
-        Add a chat bubble to the right panel.
+        Add a chat bubble to the right panel and return it.
         FIX 5: Creates ChatBubble once and mounts — never modifies after mount.
         """
+        bubble = None
         try:
-            container = self.query_one("#chat-messages", ScrollableContainer)
+            container = self._chat_container
             actual_role = "error" if error else role
             bubble = ChatBubble(role=actual_role, content=content, sql=sql)
+
+            # Reader scrolled up — hold the bubble rather than pay for a layout
+            # they can't see and yank the viewport. Their own messages always show.
+            if actual_role != "human" and not self._chat_at_bottom():
+                self._pending_bubbles.append(bubble)
+                self.unread_count = len(self._pending_bubbles)
+                return bubble
+
+            if self._pending_bubbles:
+                self._flush_pending_bubbles()
             container.mount(bubble)
             container.scroll_end(animate=False)
         except Exception as e:
             logger.debug(f"_add_chat_bubble: {e}")
+        return bubble
+
+    def _start_stream(self) -> None:
+        """
+        Start the transient in-progress agent bubble and the token timer.
+        While the reader is scrolled up the bubble is neither mounted nor
+        counted as unread — tokens wait in the queue until they return.
+        """
+        self._end_stream(self._stream_bubble)
+        self._stream_tokens = deque()   # fresh per turn — a cancelled worker keeps the old one
+        self._stream_bubble = ChatBubble(role="assistant", content="")
+        self._stream_held = True
+        self._show_stream_bubble()
+        self._stream_timer = self.set_interval(0.05, self._flush_stream_buf)
+
+    def _show_stream_bubble(self) -> None:
+        """Mount the held streaming bubble if the chat is at the bottom."""
+        if not self._chat_at_bottom():
+            return
+        self._stream_held = False
+        try:
+            if self._pending_bubbles:
+                self._flush_pending_bubbles()
+            self._chat_container.mount(self._stream_bubble)
+            self._chat_container.scroll_end(animate=False)
+        except Exception as e:
+            logger.debug(f"_show_stream_bubble: {e}")
+
+    def _flush_stream_buf(self) -> None:
+        """Move queued tokens into the streaming bubble — one update per tick."""
+        if self._stream_bubble is None:
+            return
+        if self._stream_held:
+            self._show_stream_bubble()
+            if self._stream_held:
+                return
+        tokens = self._stream_tokens
+        if not tokens:
+            return
+        parts = []
+        while tokens:
+            parts.append(tokens.popleft())
+        follow = self._chat_at_bottom()
+        self._stream_bubble.append_text("".join(parts))
+        if follow:
+            self._chat_container.scroll_end(animate=False)
+
+    def _end_stream(self, bubble: Optional[ChatBubble]) -> None:
+        """
+        Stop the token timer and drop the in-progress bubble — only if `bubble`
+        still owns the stream, so a cancelled worker can't end a newer one.
+        """
+        if bubble is not self._stream_bubble:
+            return
+        if self._stream_timer is not None:
+            self._stream_timer.stop()
+            self._stream_timer = None
+        bubble, self._stream_bubble = self._stream_bubble, None
+        held, self._stream_held = self._stream_held, False
+        self._stream_tokens.clear()
+        if bubble is not None and not held:
+            bubble.remove()
+
+    def _chat_at_bottom(self) -> bool:
+        """True if the chat panel is scrolled to (within 2 rows of) the end."""
+        container = self._chat_container
+        return container.max_scroll_y - container.scroll_y <= 2
+
+    def _flush_pending_bubbles(self) -> None:
+        """Mount all held-back bubbles in one mount_all and clear the unread count."""
+        bubbles, self._pending_bubbles = self._pending_bubbles, []
+        self.unread_count = 0
+        try:
+            self._chat_container.mount_all(bubbles)
+            self._chat_container.scroll_end(animate=False)
+        except Exception as e:
+            logger.debug(f"_flush_pending_bubbles: {e}")
+
+    def _drop_pending_bubbles(self) -> None:
+        """Discard held-back bubbles (their conversation is being replaced)."""
+        self._pending_bubbles = []
+        self.unread_count = 0
 
     def _sys(self, msg: str, level: str = "info") -> None:
-        """Write a [System] message to the query output panel."""
+        """Write a [System] message to the query output panel (main thread)."""
         colors = {
             "info":    "dim",
             "success": "green",
@@ -736,17 +1162,23 @@ class DBMAApp(App):
             "warning": "yellow",
         }
         c = colors.get(level, "dim")
-        self.call_from_thread(
-            self._print_to_query_output,
-            f"[{c}][System] {msg}[/{c}]",
-        )
+        self._print_to_query_output(f"[{c}][System] {msg}[/{c}]")
 
     def _show_system_message(self, msg: str, style: str = "info") -> None:
         """Alias for _sys — keeps compatibility with any external callers."""
         self._sys(msg, style)
 
+    def _maybe_flush_status(self) -> None:
+        """Timer callback — redraw the status bar only if something changed."""
+        if self._status_dirty:
+            self._status_dirty = False
+            self._update_status_bar()
+
     def _update_status_bar(self) -> None:
-        """Update the bottom status bar."""
+        """
+        Update the bottom status bar. Call sites set _status_dirty instead;
+        this runs from _maybe_flush_status at most 10 times a second.
+        """
         try:
             conn = (
                 "[green]● Connected[/green]"
@@ -755,23 +1187,31 @@ class DBMAApp(App):
             )
             db   = f"DB: [bold #58a6ff]{self.current_db}[/bold #58a6ff]"
             qc   = f"Queries: {self.query_count}"
-            ts   = datetime.now().strftime("%H:%M:%S")
-            self.query_one("#status-left",  Label).update(f"{conn}  │  {db}  │  {qc}")
-            self.query_one("#status-right", Label).update(f"mysql@{mysql_config.host}  │  {ts}")
+            now  = int(time.time())
+            if now != self._last_time_epoch:
+                self._last_time_epoch = now
+                self._last_time_str = datetime.fromtimestamp(now).strftime("%H:%M:%S")
+            ts   = self._last_time_str
+            left  = f"{conn}  │  {db}  │  {qc}"
+            right = f"mysql@{mysql_config.host}  │  {ts}"
+            last_left, last_right = self._status_rendered
+            if left != last_left:
+                self._status_left.update(left)
+            if right != last_right:
+                self._status_right.update(right)
+            self._status_rendered = (left, right)
         except Exception:
             pass
 
     def _update_loading_state(self, is_loading: bool) -> None:
         """Show/hide the thinking indicator in the chat label."""
-        try:
-            label = self.query_one("#chat-input-label", Label)
-            label.update(
-                " ⏳ DBMA is thinking..." if is_loading else " ⌨ Ask DBMA ▶"
-            )
-        except Exception:
-            pass
+        self._chat_input_label.update(
+            " ⏳ DBMA is thinking..." if is_loading else " ⌨ Ask DBMA ▶"
+        )
 
-    def _get_welcome_message(self) -> str:
+    @staticmethod
+    @functools.cache
+    def _get_welcome_message() -> str:
         return (
             f"Welcome to DBMA v{app_config.version}!\n\n"
             "I'm your AI-powered MySQL assistant. I can:\n"
@@ -791,23 +1231,24 @@ class DBMAApp(App):
 
     def action_clear_query_output(self) -> None:
         """Ctrl+L"""
+        self._out_buffer.clear()
         try:
-            self.query_one("#query-output", RichLog).clear()
-        except Exception:
+            self._query_output.clear()
+        except AttributeError:
             pass
 
     def action_focus_chat(self) -> None:
         """Tab"""
         try:
-            self.query_one("#chat-input").focus()
-        except Exception:
+            self._chat_input.focus()
+        except AttributeError:
             pass
 
     def action_focus_query(self) -> None:
         """Escape"""
         try:
-            self.query_one("#query-input").focus()
-        except Exception:
+            self._query_input.focus()
+        except AttributeError:
             pass
 
     def action_toggle_help(self) -> None:
@@ -817,23 +1258,36 @@ class DBMAApp(App):
 
     def action_quit(self) -> None:
         """Ctrl+C"""
-        try:
+        if self.mysql_manager.connected:
             self.mysql_manager.disconnect()
+        if self.persistence.is_connected():
             self.persistence.disconnect()
-        except Exception:
-            pass
         self.exit()
 
+    # ── Worker Message Handlers ───────────────────────────────
+
+    def on_loading_state(self, message: LoadingState) -> None:
+        self._update_loading_state(message.is_loading)
+
+    def on_query_output(self, message: QueryOutput) -> None:
+        self._out_buffer.extend(message.lines)
+
     # ── Watch Reactive State ──────────────────────────────────
 
     def watch_current_db(self, _: str) -> None:
-        self._update_status_bar()
+        self._status_dirty = True
 
     def watch_is_connected(self, _: bool) -> None:
-        self._update_status_bar()
+        self._status_dirty = True
 
     def watch_query_count(self, _: int) -> None:
-        self._update_status_bar()
+        self._status_dirty = True
+
+    def watch_unread_count(self, count: int) -> None:
+        self._chat_header.update(
+            f" 💬 DBMA Chat  [bold #58a6ff]({count} new ↓)[/bold #58a6ff]" if count
+            else " 💬 DBMA Chat"
+        )
 
 
 
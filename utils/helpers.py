@@ -1,82 +1,114 @@
 import re
 import os
+import sys
+import time
 from typing import Optional
 from datetime import datetime
 
 
+# One alternation per extractor — a single scan of the input, leftmost verb wins
+_DB_NAME_RE = re.compile(
+    r"(?:use"
+    r"|switch\s+to"
+    r"|connect\s+to"
+    r"|go\s+to(?:\s+database)?"
+    r"|open(?:\s+database)?"
+    r"|work\s+(?:on|with))"
+    r"\s+`?(\w+)`?",
+    re.IGNORECASE,
+)
+
+_TABLE_NAME_RE = re.compile(
+    r"(?:describe|desc|show\s+columns?\s+(?:of|from|in)"
+    r"|structure\s+of|schema\s+of"
+    r"|table)"
+    r"\s+`?(\w+)`?",
+    re.IGNORECASE,
+)
+
+_MYSQL_VERSION_RE = re.compile(r"(\d+\.\d+\.\d+)")
+
+_UNITS = ("B", "KB", "MB", "GB", "TB", "PB")
+
+# (epoch second, formatted) — replaced as one tuple so readers never see a torn pair
+_ts_cache = (0, "")
+
+_DEFAULT_SUFFIX = "..."
+_DEFAULT_SUFFIX_LEN = len(_DEFAULT_SUFFIX)
+
+# First whitespace-delimited token — matched without splitting the whole string
+_FIRST_WORD_RE = re.compile(r"\s*(\S+)")
+_SAFE_KEYWORDS = frozenset({"SELECT", "SHOW", "DESCRIBE", "DESC", "EXPLAIN"})
+# Upper/lower/capitalized spellings — the common cases skip the .upper() copy
+_SAFE_KEYWORDS_CASED = frozenset(
+    v for kw in _SAFE_KEYWORDS for v in (kw, kw.lower(), kw.capitalize())
+)
+
+
 def format_bytes(size_bytes: int) -> str:
     if size_bytes == 0:
         return "0 B"
-    for unit in ["B", "KB", "MB", "GB", "TB"]:
-        if size_bytes < 1024:
-            return f"{size_bytes:.1f} {unit}"
-        size_bytes /= 1024
-    return f"{size_bytes:.1f} PB"
+    # Sub-KB (including fractional and negative input) stays in bytes
+    if size_bytes < 1024:
+        return f"{size_bytes:.1f} B"
+    # Every 10 bits is one 1024× unit step
+    idx = min((int(size_bytes).bit_length() - 1) // 10, 5)
+    return f"{size_bytes / (1 << (idx * 10)):.1f} {_UNITS[idx]}"
 
 
-def truncate_string(s: str, max_len: int = 80, suffix: str = "...") -> str:
+def truncate_string(s: str, max_len: int = 80, suffix: str = _DEFAULT_SUFFIX) -> str:
     if len(s) <= max_len:
         return s
+    if suffix is _DEFAULT_SUFFIX:
+        return s[: max_len - _DEFAULT_SUFFIX_LEN] + suffix
     return s[: max_len - len(suffix)] + suffix
 
 
 def sanitize_sql(sql: str) -> str:
     sql = sql.strip().rstrip(";").strip()
-    if ";" in sql:
-        first_stmt = sql.split(";")[0].strip()
+    idx = sql.find(";")
+    if idx != -1:
+        first_stmt = sql[:idx].strip()
         if first_stmt:
             return first_stmt
     return sql
 
 
 def extract_database_name_from_input(user_input: str) -> Optional[str]:
-    patterns = [
-        r"use\s+`?(\w+)`?",
-        r"switch\s+to\s+`?(\w+)`?",
-        r"connect\s+to\s+`?(\w+)`?",
-        r"go\s+to\s+(?:database\s+)?`?(\w+)`?",
-        r"open\s+(?:database\s+)?`?(\w+)`?",
-        r"work\s+(?:on|with)\s+`?(\w+)`?",
-    ]
-    for pattern in patterns:
-        match = re.search(pattern, user_input, re.IGNORECASE)
-        if match:
-            return match.group(1)
-    return None
+    match = _DB_NAME_RE.search(user_input)
+    return match.group(1) if match else None
 
 
 def extract_table_name_from_input(user_input: str) -> Optional[str]:
-    patterns = [
-        r"(?:describe|desc|show\s+columns?\s+(?:of|from|in))\s+`?(\w+)`?",
-        r"(?:structure\s+of|schema\s+of)\s+`?(\w+)`?",
-        r"table\s+`?(\w+)`?",
-    ]
-    for pattern in patterns:
-        match = re.search(pattern, user_input, re.IGNORECASE)
-        if match:
-            return match.group(1)
-    return None
+    match = _TABLE_NAME_RE.search(user_input)
+    return match.group(1) if match else None
 
 
 def is_safe_query(sql: str) -> bool:
-    first_word = sql.strip().split()[0].upper() if sql.strip() else ""
-    safe_keywords = {"SELECT", "SHOW", "DESCRIBE", "DESC", "EXPLAIN"}
-    return first_word in safe_keywords
+    match = _FIRST_WORD_RE.match(sql)
+    if match is None:
+        return False
+    word = match.group(1)
+    return word in _SAFE_KEYWORDS_CASED or word.upper() in _SAFE_KEYWORDS
 
 
 def format_duration(milliseconds: int) -> str:
     if milliseconds < 1000:
         return f"{milliseconds}ms"
-    elif milliseconds < 60000:
+    if milliseconds < 60000:
         return f"{milliseconds / 1000:.2f}s"
-    else:
-        minutes = milliseconds // 60000
-        seconds = (milliseconds % 60000) / 1000
-        return f"{minutes}m {seconds:.1f}s"
+    minutes, rem = divmod(milliseconds, 60000)
+    return f"{minutes}m {rem / 1000:.1f}s"
 
 
 def get_timestamp() -> str:
-    return datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    global _ts_cache
+    now = int(time.time())
+    cached_now, text = _ts_cache
+    if now != cached_now:
+        text = datetime.fromtimestamp(now).strftime("%Y-%m-%d %H:%M:%S")
+        _ts_cache = (now, text)
+    return text
 
 
 def build_thread_display_name(thread_id: str, db_name: str, host: str) -> str:
@@ -84,9 +116,14 @@ def build_thread_display_name(thread_id: str, db_name: str, host: str) -> str:
 
 
 def parse_mysql_version(version_string: str) -> str:
-    match = re.search(r"(\d+\.\d+\.\d+)", version_string)
+    match = _MYSQL_VERSION_RE.search(version_string)
     return match.group(1) if match else version_string
 
 
 def clear_terminal():
-    os.system("clear" if os.name != "nt" else "cls")
\ No newline at end of file
+    # Legacy Windows console (not Windows Terminal) may not honour ANSI escapes
+    if os.name == "nt" and not os.environ.get("WT_SESSION"):
+        os.system("cls")
+        return
+    sys.stdout.write("\x1b[2J\x1b[H")
+    sys.stdout.flush()
\ No newline at end of file
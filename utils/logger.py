@@ -1,25 +1,137 @@
+import os
 import sys
+import copy
+import queue
+import atexit
+import zipfile
+import threading
 from pathlib import Path
 from loguru import logger
 
 
+FILE_LOG_QUEUE_SIZE = 10_000
+
+
+def format_file_line(message) -> str:
+    """
+    Render a file-log line from a loguru message whose sink format is just
+    "{message}" (loguru appends the newline and any exception text).
+    Equivalent to "{time:YYYY-MM-DD HH:mm:ss} | {level:<8} |
+    {module}:{function}:{line} | {message}" but built with one f-string.
+    """
+    r = message.record
+    return (
+        f"{r['time']:%Y-%m-%d %H:%M:%S} | {r['level'].name:<8} | "
+        f"{r['module']}:{r['function']}:{r['line']} | {message}"
+    )
+
+
+class BoundedQueueSink:
+    """
+    Loguru sink that hands records to a writer thread through a bounded
+    queue. When the queue is full the record is dropped and counted, so
+    callers never block on disk I/O or rotation and memory stays capped
+    (loguru's enqueue=True queue is unbounded). ``formatter`` runs on the
+    writer thread.
+    """
+
+    def __init__(self, write, formatter=str, maxsize: int = FILE_LOG_QUEUE_SIZE):
+        self._write = write
+        self._formatter = formatter
+        self._queue: queue.Queue = queue.Queue(maxsize=maxsize)
+        self.dropped = 0
+        self._reported = 0
+        threading.Thread(target=self._drain, name="dbma-log-writer", daemon=True).start()
+        atexit.register(self.flush)
+
+    def __call__(self, message) -> None:
+        try:
+            self._queue.put_nowait(message)
+        except queue.Full:
+            self.dropped += 1
+
+    def flush(self) -> None:
+        """Block until every queued record has been written."""
+        self._queue.join()
+
+    def _drain(self) -> None:
+        while True:
+            message = self._queue.get()
+            try:
+                if self.dropped != self._reported:
+                    lost, self._reported = self.dropped - self._reported, self.dropped
+                    self._write(f"[logger] {lost} record(s) dropped — log queue full\n")
+                self._write(self._formatter(message))
+            except Exception:
+                pass
+            finally:
+                self._queue.task_done()
+
+
+class BackgroundZipper:
+    """
+    Loguru ``compression=`` callable that zips rotated files on a daemon
+    thread. Loguru calls compression inline during rotation, which would
+    stall the log writer for as long as the archive takes to build.
+    """
+
+    def __init__(self):
+        self._queue: queue.Queue = queue.Queue()
+        threading.Thread(target=self._drain, name="dbma-log-zipper", daemon=True).start()
+        atexit.register(self._queue.join)
+
+    def __call__(self, path: str) -> None:
+        self._queue.put(path)
+
+    def _drain(self) -> None:
+        while True:
+            path = self._queue.get()
+            try:
+                self._compress(path)
+            except Exception:
+                pass
+            finally:
+                self._queue.task_done()
+
+    @staticmethod
+    def _compress(path: str) -> None:
+        archive, n = f"{path}.zip", 1
+        while os.path.exists(archive):
+            archive, n = f"{path}.{n}.zip", n + 1
+        with zipfile.ZipFile(archive, "w", compression=zipfile.ZIP_DEFLATED) as zf:
+            zf.write(path, os.path.basename(path))
+        os.remove(path)
+
+
 def setup_logger(log_file: str = "logs/dbma.log", level: str = "INFO"):
     logger.remove()
 
     Path(log_file).parent.mkdir(parents=True, exist_ok=True)
 
-    logger.add(
+    # The file (with rotation/compression) is owned by an independent logger
+    # that only the writer thread touches; it receives pre-formatted text
+    file_logger = copy.deepcopy(logger)
+    file_logger.add(
         log_file,
         rotation="10 MB",
         retention="7 days",
-        compression="zip",
+        compression=BackgroundZipper(),
+        level=0,
+        format="{message}",
+    )
+    write_raw = file_logger.opt(raw=True).info
+
+    # Only "{message}" goes through loguru's template; the line prefix is
+    # built by format_file_line on the writer thread
+    logger.add(
+        BoundedQueueSink(write_raw, format_file_line),
         level=level,
-        format="{time:YYYY-MM-DD HH:mm:ss} | {level:<8} | {module}:{function}:{line} | {message}",
+        format="{message}",
         backtrace=True,
         diagnose=True,
-        enqueue=True,
     )
 
+    # Low volume (CRITICAL only) — written synchronously
     logger.add(
         sys.stderr,
         level="CRITICAL",
@@ -27,4 +139,4 @@ def setup_logger(log_file: str = "logs/dbma.log", level: str = "INFO"):
     )
 
     logger.info("DBMA Logger initialized")
-    return logger
\ No newline at end of file
+    return logger